@@ -1,13 +1,29 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from src.components.loading_screen import LoadingScreen
 from src.components.transactions import TransactionInput, TransactionList
 from src.components.charts import FinancialCharts
+from src.components.budgets import BudgetDialog
+from src.components.categories import RulesDialog
+from src.components.background_charts import BackgroundCharts
 from src.styles.theme import AppTheme
-from src.utils.animations import ValueAnimator
+from src.utils.animation_scheduler import AnimationScheduler
 from src.utils.file_handler import FileHandler
+from src.utils.ledger import LedgerHistory, PersistentVector
+from src.utils.budget import BudgetEngine
+from src.utils.categorizer import AutoCategorizer
+from src.utils.anomaly import AnomalyDetector
+from src.utils.reports import generate_reports
+from src.utils.partitioned_store import group_by_month, RECENT_MONTHS, MANIFEST_NAME
+from src.utils.ingest_server import IngestServer, DEFAULT_HOST, DEFAULT_PORT
+from src.utils.currency import (
+    RateTable, CurrencyTotals, CurrencyError, DEFAULT_CURRENCY, CURRENCY_SYMBOLS, format_money,
+    convert_transactions
+)
 import time
 import datetime
+import os
+import threading
 
 class PersonalFinanceTracker:
     def __init__(self, root):
@@ -36,10 +52,47 @@ class PersonalFinanceTracker:
         screen_height = root.winfo_screenheight()
         self.root.geometry(f"{screen_width}x{screen_height}+0+0")
         
-        # Initialize transaction data
+        # One shared frame loop animates the balance labels
+        self.animator = AnimationScheduler(self.root)
+        
+        # Initialize transaction data (amounts and totals are in cents)
         self.transactions = []
-        self.total_income = 0.0
-        self.total_expenses = 0.0
+        self.total_income = 0
+        self.total_expenses = 0
+        
+        # Versioned ledger state for undo/redo and bookmarks
+        self.history = LedgerHistory()
+        
+        # Ledger folder with monthly partitions, if one is open. Months outside
+        # the working set are archived: their totals come from the manifest and
+        # their rows are only read when the user scrolls or searches back
+        self.close_store()
+        
+        # Rule-based categories, cached per description
+        self.categorizer = AutoCategorizer()
+        
+        # Running per-merchant statistics that flag unusual transactions
+        self.anomalies = AnomalyDetector()
+        
+        # Daily exchange rates and totals converted into the display currency
+        try:
+            self.rates = RateTable.load_directory()
+        except (OSError, CurrencyError) as e:
+            messagebox.showwarning("Exchange Rates", f"The rate tables could not be read: {str(e)}")
+            self.rates = RateTable()
+        self.currency_totals = CurrencyTotals(self.rates)
+        self.display_currency = DEFAULT_CURRENCY
+        self.budget_alerts = []
+        self.currency_alerts = []
+        
+        # Budgets with running consumption totals, kept in the base currency
+        self.budgets = BudgetEngine(
+            self.categorizer.category,
+            lambda transaction: self.rates.convert_amount(transaction, DEFAULT_CURRENCY)
+        )
+        
+        # Optional local server for scripted transaction ingestion
+        self.ingest_server = None
         
         # Setup menu
         self.setup_menu()
@@ -79,11 +132,80 @@ class PersonalFinanceTracker:
         file_menu.add_command(label="Save", command=self.save_data)
         file_menu.add_command(label="Load", command=self.load_data)
         file_menu.add_separator()
+        file_menu.add_command(label="Open Ledger Folder...", command=self.open_ledger_folder)
+        file_menu.add_command(label="Save to Ledger Folder...", command=self.save_ledger_folder)
+        file_menu.add_separator()
         file_menu.add_command(label="Export to CSV", command=self.export_to_csv)
         file_menu.add_command(label="Import from CSV", command=self.import_from_csv)
+        file_menu.add_command(label="Export to Arrow/Parquet...", command=self.export_to_columnar)
+        file_menu.add_command(label="Import from Arrow/Parquet...", command=self.import_from_columnar)
+        file_menu.add_command(label="Import Bank Statement (OFX/QFX/QIF)...", command=self.import_statement)
+        file_menu.add_separator()
+        file_menu.add_command(label="Generate Monthly Reports...", command=lambda: self.generate_reports("month"))
+        file_menu.add_command(label="Generate Annual Reports...", command=lambda: self.generate_reports("year"))
+        file_menu.add_separator()
+        self.ingest_var = tk.BooleanVar(value=False)
+        file_menu.add_checkbutton(
+            label=f"Ingestion Server ({DEFAULT_HOST}:{DEFAULT_PORT})",
+            variable=self.ingest_var,
+            command=self.toggle_ingest_server
+        )
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
+        # Create Edit menu
+        edit_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Edit", menu=edit_menu)
+        
+        # Add edit menu items
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Bookmark Version...", command=self.bookmark_version)
+        edit_menu.add_command(label="Restore Bookmark...", command=self.restore_bookmark)
+        edit_menu.add_command(label="Compare with Bookmark...", command=self.compare_with_bookmark)
+        
+        # Create Budgets menu
+        budget_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Budgets", menu=budget_menu)
+        
+        # Add budget menu items
+        budget_menu.add_command(label="Set Budget...", command=self.set_budget)
+        budget_menu.add_command(label="View Budgets", command=self.view_budgets)
+        
+        # Create Categories menu
+        category_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Categories", menu=category_menu)
+        
+        # Add category menu items
+        category_menu.add_command(label="Edit Rules...", command=self.edit_category_rules)
+        
+        # Create Currency menu
+        self.currency_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Currency", menu=self.currency_menu)
+        
+        # Add currency menu items; display currencies follow the separator
+        self.currency_menu.add_command(label="Load Rate Table...", command=self.load_rate_table)
+        self.currency_menu.add_separator()
+        self.currency_var = tk.StringVar(value=self.display_currency)
+        self.update_currency_menu()
+        
+        # Keyboard shortcuts for undo/redo
+        self.root.bind_all("<Control-z>", lambda event: self.history_shortcut(event, self.undo))
+        self.root.bind_all("<Control-y>", lambda event: self.history_shortcut(event, self.redo))
+        
+        # Create View menu
+        view_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="View", menu=view_menu)
+        
+        # Charts are rasterized off the UI thread unless interactive charts are wanted
+        self.background_charts_var = tk.BooleanVar(value=True)
+        view_menu.add_checkbutton(
+            label="Render Charts in Background",
+            variable=self.background_charts_var,
+            command=self.toggle_background_charts
+        )
+        
         # Create Help menu
         help_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.menu_bar.add_cascade(label="Help", menu=help_menu)
@@ -94,32 +216,60 @@ class PersonalFinanceTracker:
     
     def new_data(self):
         """Clear all data and start fresh"""
-        if messagebox.askyesno("New Data", "Are you sure you want to clear all data? This cannot be undone."):
-            # Reset transaction data
-            self.transactions = []
-            self.total_income = 0.0
-            self.total_expenses = 0.0
-            
-            # Update UI
-            self.income_label.config(text="$0.00")
-            self.expense_label.config(text="$0.00")
-            self.balance_label.config(text="$0.00")
-            
-            # Clear transaction list
-            self.transaction_list.clear_transactions()
-            
-            # Update charts
-            self.charts.update_charts([])
+        if messagebox.askyesno("New Data", "Are you sure you want to clear all data? You can undo this from the Edit menu."):
+            self.close_store()
+            self.replace_transactions([], label="New data")
             
             messagebox.showinfo("New Data", "All data has been cleared.")
     
+    def replace_transactions(self, transactions, label="Replace data"):
+        """Replace all transaction data with a batch as a new undoable version"""
+        self.show_version(self.history.replace(transactions, label, source=self.store_state()))
+    
+    def show_version(self, version):
+        """Display a ledger version and refresh the UI once"""
+        # Each version remembers the ledger folder it belongs to, so undoing
+        # past New, Load or Import reopens the folder with its archived months
+        self.restore_store_state(version.source)
+        
+        # Update transaction data; archived months loaded so far come first
+        self.transactions = self.archive + list(version.transactions)
+        self.total_income = version.total_income + self.archive_income
+        self.total_expenses = version.total_expenses + self.archive_expenses
+        
+        # Re-sum amounts per currency and day; archived months not read yet come from the manifest
+        self.currency_totals.rebuild(self.transactions, self.unloaded_daily_totals())
+        
+        # Update UI
+        self.show_totals()
+        
+        # Categorize new descriptions, then recount budget consumption once for the whole batch
+        self.categorizer.rebuild(self.transactions)
+        self.budgets.rebuild(self.transactions)
+        self.show_budget_alerts(self.budgets.alerts())
+        
+        # Replay the ledger through the anomaly statistics
+        self.anomalies.rebuild(self.transactions)
+        
+        # Update transaction list
+        self.transaction_list.set_transactions(self.transactions)
+        
+        # Update charts
+        self.charts.update_charts(self.transactions)
+    
     def save_data(self):
         """Save financial data to a file"""
+        # A single file holds the whole history
+        self.load_all_history()
+        
         # Prepare data to save
         data = {
             "transactions": self.transaction_list.get_all_transactions(),
             "total_income": self.total_income,
             "total_expenses": self.total_expenses,
+            "amount_unit": "cents",
+            "budgets": self.budgets.to_list(),
+            "category_rules": self.categorizer.to_list(),
             "saved_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
@@ -130,61 +280,23 @@ class PersonalFinanceTracker:
     def load_data(self):
         """Load financial data from a file"""
         # Confirm if there's unsaved data
-        if self.transactions and messagebox.askyesno("Unsaved Data", 
-                                                   "Loading will replace your current data. Continue?"):
-            # Load data using FileHandler
-            data = FileHandler.load_data()
-            
-            if data:
-                # Update transaction data
-                self.transactions = data.get("transactions", [])
-                self.total_income = data.get("total_income", 0.0)
-                self.total_expenses = data.get("total_expenses", 0.0)
-                
-                # Update UI
-                self.income_label.config(text=f"${self.total_income:.2f}")
-                self.expense_label.config(text=f"${self.total_expenses:.2f}")
-                self.balance_label.config(text=f"${self.total_income - self.total_expenses:.2f}")
-                
-                # Update transaction list
-                self.transaction_list.clear_transactions()
-                for transaction in self.transactions:
-                    self.transaction_list.add_transaction(transaction, update_ui=False)
-                
-                # Update charts
-                self.charts.update_charts(self.transactions)
-                
-                # Show success message with saved date if available
-                saved_date = data.get("saved_date", "Unknown")
-                messagebox.showinfo("Load Successful", 
-                                   f"Your financial data has been loaded successfully.\nLast saved: {saved_date}")
-        elif not self.transactions:
-            # If no current data, load without confirmation
-            data = FileHandler.load_data()
+        if self.transactions and not messagebox.askyesno("Unsaved Data", 
+                                                       "Loading will replace your current data. Continue?"):
+            return
+        
+        # Load data using FileHandler
+        data = FileHandler.load_data()
+        
+        if data:
+            self.close_store()
+            self.budgets.load_list(data.get("budgets", []))
+            self.load_category_rules(data.get("category_rules", []))
+            self.replace_transactions(data.get("transactions", []), label="Load data")
             
-            if data:
-                # Update transaction data
-                self.transactions = data.get("transactions", [])
-                self.total_income = data.get("total_income", 0.0)
-                self.total_expenses = data.get("total_expenses", 0.0)
-                
-                # Update UI
-                self.income_label.config(text=f"${self.total_income:.2f}")
-                self.expense_label.config(text=f"${self.total_expenses:.2f}")
-                self.balance_label.config(text=f"${self.total_income - self.total_expenses:.2f}")
-                
-                # Update transaction list
-                self.transaction_list.clear_transactions()
-                for transaction in self.transactions:
-                    self.transaction_list.add_transaction(transaction, update_ui=False)
-                
-                # Update charts
-                self.charts.update_charts(self.transactions)
-                
-                # Show success message with saved date if available
-                saved_date = data.get("saved_date", "Unknown")
-                messagebox.showinfo("Load Successful", 
-                                   f"Your financial data has been loaded successfully.\nLast saved: {saved_date}")
+            # Show success message with saved date if available
+            saved_date = data.get("saved_date", "Unknown")
+            messagebox.showinfo("Load Successful", 
+                               f"Your financial data has been loaded successfully.\nLast saved: {saved_date}")
     
     def export_to_csv(self):
         """Export transaction data to CSV"""
@@ -192,77 +304,555 @@ class PersonalFinanceTracker:
             messagebox.showinfo("No Data", "There is no data to export.")
             return
         
-        if FileHandler.export_to_csv(self.transactions):
+        self.load_all_history()
+        if FileHandler.export_to_csv(self.categorizer.categorized(self.transactions)):
             messagebox.showinfo("Export Successful", "Your financial data has been exported to CSV successfully.")
     
     def import_from_csv(self):
         """Import transaction data from CSV"""
         # Confirm if there's unsaved data
-        if self.transactions and messagebox.askyesno("Unsaved Data", 
-                                                   "Importing will replace your current data. Continue?"):
-            transactions = FileHandler.import_from_csv()
-            
-            if transactions:
-                # Reset current data
-                self.transactions = []
-                self.total_income = 0.0
-                self.total_expenses = 0.0
-                
-                # Process imported transactions
-                for transaction in transactions:
-                    if transaction['type'] == "Income":
-                        self.total_income += transaction['amount']
-                    else:
-                        self.total_expenses += transaction['amount']
-                
-                # Update UI
-                self.income_label.config(text=f"${self.total_income:.2f}")
-                self.expense_label.config(text=f"${self.total_expenses:.2f}")
-                self.balance_label.config(text=f"${self.total_income - self.total_expenses:.2f}")
-                
-                # Update transaction list
-                self.transaction_list.clear_transactions()
-                for transaction in transactions:
-                    self.transaction_list.add_transaction(transaction, update_ui=False)
-                
-                # Update charts
-                self.charts.update_charts(transactions)
-                
-                # Update transactions list
-                self.transactions = transactions
-                
-                messagebox.showinfo("Import Successful", 
-                                   f"Successfully imported {len(transactions)} transactions.")
-        elif not self.transactions:
-            # If no current data, import without confirmation
-            transactions = FileHandler.import_from_csv()
+        if self.transactions and not messagebox.askyesno("Unsaved Data", 
+                                                       "Importing will replace your current data. Continue?"):
+            return
+        
+        transactions = FileHandler.import_from_csv()
+        
+        if transactions:
+            self.import_transactions(transactions, "Import from CSV")
+    
+    def export_to_columnar(self):
+        """Export transaction data to a typed Arrow or Parquet file"""
+        if not self.transactions:
+            messagebox.showinfo("No Data", "There is no data to export.")
+            return
+        
+        self.load_all_history()
+        if FileHandler.export_to_columnar(self.categorizer.categorized(self.transactions)):
+            messagebox.showinfo("Export Successful", "Your financial data has been exported successfully.")
+    
+    def import_from_columnar(self):
+        """Import transaction data from an Arrow or Parquet file"""
+        # Confirm if there's unsaved data
+        if self.transactions and not messagebox.askyesno("Unsaved Data", 
+                                                       "Importing will replace your current data. Continue?"):
+            return
+        
+        transactions = FileHandler.import_from_columnar()
+        
+        if transactions is not None:
+            self.import_transactions(transactions, "Import from Arrow/Parquet")
+    
+    def import_statement(self):
+        """Import transactions from an OFX, QFX or QIF bank statement"""
+        # Confirm if there's unsaved data
+        if self.transactions and not messagebox.askyesno("Unsaved Data", 
+                                                       "Importing will replace your current data. Continue?"):
+            return
+        
+        transactions = FileHandler.import_statement()
+        
+        if transactions is not None:
+            self.import_transactions(transactions, "Import bank statement")
+    
+    def import_transactions(self, transactions, label):
+        """Replace the ledger with imported transactions, streamed from any iterable"""
+        try:
+            vector = PersistentVector.from_iterable(transactions)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", f"An error occurred while importing: {str(e)}")
+            return
+        
+        if not len(vector):
+            messagebox.showinfo("Import", "No transactions were found to import.")
+            return
+        
+        self.close_store()
+        self.replace_transactions(vector, label=label)
+        
+        messagebox.showinfo("Import Successful", 
+                           f"Successfully imported {len(vector)} transactions.")
+    
+    def close_store(self):
+        """Forget the open ledger folder and its archived months"""
+        self.store = None
+        self.working_months = set()
+        self.archive_months = set()
+        self.archive_partitions = {}
+        self.archive = []
+        self.archive_income = 0
+        self.archive_expenses = 0
+    
+    def store_state(self):
+        """Capture the open ledger folder so ledger versions can restore it"""
+        if not self.store:
+            return None
+        return (self.store, self.working_months, self.archive_months, self.archive_partitions,
+                self.archive_income, self.archive_expenses)
+    
+    def restore_store_state(self, state):
+        """Reopen the ledger folder captured by store_state()"""
+        self.close_store()
+        if state is None:
+            return
+        
+        (self.store, self.working_months, self.archive_months, self.archive_partitions,
+         self.archive_income, self.archive_expenses) = state
+        self.archive = [
+            transaction
+            for month in sorted(self.archive_partitions)
+            for transaction in self.archive_partitions[month]
+        ]
+    
+    def open_ledger_folder(self):
+        """Open a partitioned ledger, reading only its most recent months"""
+        # Confirm if there's unsaved data
+        if self.transactions and not messagebox.askyesno("Unsaved Data", 
+                                                       "Opening will replace your current data. Continue?"):
+            return
+        
+        store = FileHandler.open_partitioned()
+        if not store:
+            return
+        
+        months = store.months()
+        recent = months[-RECENT_MONTHS:]
+        try:
+            working = [transaction for month in recent for transaction in store.read_partition(month)]
+        except Exception as e:
+            messagebox.showerror("Load Error", f"An error occurred while loading: {str(e)}")
+            return
+        
+        self.close_store()
+        self.store = store
+        self.working_months = set(recent)
+        self.archive_months = set(months) - self.working_months
+        
+        # All-time totals of archived months come straight from the manifest
+        self.archive_income, self.archive_expenses, _ = store.totals(self.archive_months)
+        
+        self.budgets.load_list(store.manifest.get("budgets", []))
+        self.load_category_rules(store.manifest.get("category_rules", []))
+        self.replace_transactions(working, label="Open ledger folder")
+    
+    def unloaded_daily_totals(self):
+        """Get per-day totals of archived months that have not been read yet"""
+        if not self.store:
+            return []
+        return self.store.daily_totals(self.archive_months - set(self.archive_partitions))
+    
+    def load_archive_months(self, months):
+        """
+        Read archived months from the open ledger folder into the view
+        
+        Returns:
+            bool: True if any new month was read
+        """
+        months = sorted(set(months) & self.archive_months - set(self.archive_partitions))
+        if not months:
+            return False
+        
+        try:
+            for month in months:
+                self.archive_partitions[month] = self.store.read_partition(month)
+        except Exception as e:
+            messagebox.showerror("Load Error", f"An error occurred while loading: {str(e)}")
+            return False
+        
+        # The partitions are shared with the current version's source
+        self.show_version(self.history.current)
+        return True
+    
+    def load_all_history(self):
+        """Read every archived month, e.g. before saving everything to one file"""
+        if self.store:
+            self.load_archive_months(self.archive_months)
+    
+    def load_older_history(self):
+        """Read the next older archived month when the list is scrolled to the top"""
+        pending = sorted(self.archive_months - set(self.archive_partitions))
+        if not pending:
+            return
+        
+        previous_count = len(self.transactions)
+        if self.load_archive_months(pending[-1:]):
+            # Keep the rows the user was looking at in view
+            added = len(self.transactions) - previous_count
+            self.transaction_list.scroll_to_fraction(added / len(self.transactions))
+    
+    def load_history_range(self, low, high):
+        """
+        Read archived months overlapping a searched date range
+        
+        Returns:
+            bool: True if any new month was read
+        """
+        return self.load_archive_months(
+            month for month in self.archive_months
+            if (low is None or month >= low[:7]) and (high is None or month <= high[:7])
+        )
+    
+    def save_ledger_folder(self):
+        """Save the ledger as one file per month plus a manifest"""
+        directory = FileHandler.ask_partitioned_folder()
+        if not directory:
+            return
+        
+        extra = {
+            "budgets": self.budgets.to_list(),
+            "category_rules": self.categorizer.to_list(),
+            "saved_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        working = group_by_month(self.history.current.transactions)
+        
+        # New rows dated in an archived month are merged into that partition
+        self.load_archive_months(month for month in working if month in self.archive_months)
+        for month in working:
+            if month in self.archive_months:
+                working[month] = self.archive_partitions[month] + working[month]
+        
+        if self.store and os.path.abspath(directory) == os.path.abspath(self.store.directory):
+            # Only rewrite months that are in memory; months emptied by undo are removed
+            for month in self.working_months:
+                working.setdefault(month, [])
+            saved = FileHandler.update_partitions(self.store, working, **extra)
+        else:
+            # Never replace another saved ledger without asking
+            if os.path.exists(os.path.join(directory, MANIFEST_NAME)) and not messagebox.askyesno(
+                    "Replace Ledger Folder",
+                    "This folder already holds a saved ledger. Replace it with the current data?\n\n"
+                    "Months that are not part of the current data will be deleted from the folder.",
+                    icon=messagebox.WARNING, default=messagebox.NO):
+                return
             
+            # Copy the entire history into the new folder
+            self.load_all_history()
+            transactions = [
+                transaction
+                for month in sorted(set(self.archive_partitions) | set(working))
+                for transaction in working.get(month, self.archive_partitions.get(month, []))
+            ]
+            store = FileHandler.save_partitioned(directory, transactions, **extra)
+            if store:
+                # Fresh state for the new folder; older versions keep the folder they came from
+                self.store = store
+                self.working_months = set(working) - self.archive_months
+                self.archive_months = set(self.archive_months)
+                self.archive_partitions = dict(self.archive_partitions)
+                self.history.set_source(self.store_state())
+            saved = bool(store)
+        
+        if saved:
+            self.working_months |= set(working) - self.archive_months
+            messagebox.showinfo("Save Successful", "Your financial data has been saved successfully.")
+    
+    def generate_reports(self, period):
+        """Render PNG/PDF reports per period in background worker processes"""
+        if not self.transactions:
+            messagebox.showinfo("No Data", "There is no data to report on.")
+            return
+        
+        out_dir = filedialog.askdirectory(title="Choose a folder for the reports")
+        if not out_dir:
+            return
+        
+        # Render off the UI thread and poll for the result
+        result = {}
+        # Reports cover the whole history, like the balance panel
+        self.load_all_history()
+        
+        # Rule categories live in the categorizer, so the worker processes get
+        # filled-in copies, with amounts converted into the display currency
+        currency = self.display_currency
+        transactions, missing = convert_transactions(
+            self.categorizer.categorized(self.transactions), self.rates, currency)
+        if missing and not messagebox.askyesno(
+                "Generate Reports",
+                f"There are no {currency} rates for {', '.join(missing)}. "
+                f"Generate the reports without those transactions?"):
+            return
+        
+        def worker():
+            try:
+                result["manifest"] = generate_reports({"ledger": transactions}, out_dir, period, currency=currency)
+            except Exception as e:
+                result["error"] = e
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        self.root.after(200, self.check_reports, thread, result)
+    
+    def check_reports(self, thread, result):
+        """Report the outcome of a background report run once it finishes"""
+        if thread.is_alive():
+            self.root.after(200, self.check_reports, thread, result)
+        elif "error" in result:
+            messagebox.showerror("Report Error", f"An error occurred while generating reports: {result['error']}")
+        else:
+            messagebox.showinfo("Reports Generated", f"Reports have been written.\nIndex: {result['manifest']}")
+    
+    def toggle_ingest_server(self):
+        """Start or stop the local ingestion server from the File menu"""
+        if self.ingest_var.get():
+            if self.ingest_server:
+                # The previous server still holds the port while it finishes
+                self.ingest_var.set(False)
+                messagebox.showinfo("Ingestion Server", "The ingestion server is still stopping. Try again in a moment.")
+                return
+            server = IngestServer()
+            try:
+                server.start()
+            except OSError as e:
+                self.ingest_var.set(False)
+                messagebox.showerror("Ingestion Server", f"Could not start the ingestion server: {str(e)}")
+                return
+            self.ingest_server = server
+            self.root.after(50, self.poll_ingest_server)
+        elif self.ingest_server:
+            # Polling continues until the server has flushed what clients already sent
+            self.ingest_server.request_stop()
+    
+    def poll_ingest_server(self):
+        """Move batches received by the ingestion server into the ledger"""
+        server = self.ingest_server
+        if not server:
+            return
+        
+        # Once the server thread has exited, this drain is the last one
+        finished = server.is_stopping() and not server.is_running()
+        if finished:
+            self.ingest_server = None
+        
+        # Keep polling even if a batch fails to apply
+        try:
+            transactions = server.drain()
             if transactions:
-                # Process imported transactions
-                for transaction in transactions:
-                    if transaction['type'] == "Income":
-                        self.total_income += transaction['amount']
-                    else:
-                        self.total_expenses += transaction['amount']
-                
-                # Update UI
-                self.income_label.config(text=f"${self.total_income:.2f}")
-                self.expense_label.config(text=f"${self.total_expenses:.2f}")
-                self.balance_label.config(text=f"${self.total_income - self.total_expenses:.2f}")
-                
-                # Update transaction list
-                self.transaction_list.clear_transactions()
-                for transaction in transactions:
-                    self.transaction_list.add_transaction(transaction, update_ui=False)
-                
-                # Update charts
-                self.charts.update_charts(transactions)
-                
-                # Update transactions list
-                self.transactions = transactions
-                
-                messagebox.showinfo("Import Successful", 
-                                   f"Successfully imported {len(transactions)} transactions.")
+                self.append_transactions(transactions)
+        finally:
+            if not finished:
+                self.root.after(50, self.poll_ingest_server)
+    
+    def append_transactions(self, transactions):
+        """Append a batch of transactions, updating totals and charts once"""
+        transactions = list(transactions)
+        if not transactions:
+            return
+        
+        version = self.history.extend(transactions)
+        self.transactions.extend(transactions)
+        self.total_income = version.total_income + self.archive_income
+        self.total_expenses = version.total_expenses + self.archive_expenses
+        self.currency_totals.add(transactions)
+        
+        # Update UI
+        self.show_totals()
+        
+        # Categorize the batch and count it against budgets
+        self.categorizer.add(transactions)
+        crossed = False
+        for transaction in transactions:
+            crossed = bool(self.budgets.record(transaction)) or crossed
+        if crossed:
+            self.show_budget_alerts(self.budgets.alerts())
+        
+        # Check the batch for unusual amounts
+        for transaction in transactions:
+            self.anomalies.observe(transaction)
+        
+        # Update transaction list
+        self.transaction_list.add_transactions(transactions)
+        
+        # Update charts
+        self.charts.update_charts(self.transactions)
+    
+    def history_shortcut(self, event, action):
+        """Run undo/redo from the keyboard unless a text field has focus"""
+        # Text fields keep Ctrl+Z/Ctrl+Y for their own editing
+        if isinstance(event.widget, (tk.Entry, tk.Text)):
+            return
+        action()
+    
+    def undo(self):
+        """Restore the previous ledger version"""
+        version = self.history.undo()
+        if version is not None:
+            self.show_version(version)
+    
+    def redo(self):
+        """Re-apply the last undone ledger version"""
+        version = self.history.redo()
+        if version is not None:
+            self.show_version(version)
+    
+    def ask_bookmark_name(self, title):
+        """Ask the user to pick one of the existing bookmarks"""
+        if not self.history.bookmarks:
+            messagebox.showinfo(title, "There are no bookmarked versions yet.")
+            return None
+        
+        names = ", ".join(sorted(self.history.bookmarks))
+        name = simpledialog.askstring(title, f"Bookmark name ({names}):", parent=self.root)
+        if name and name not in self.history.bookmarks:
+            messagebox.showerror(title, f"There is no bookmark named '{name}'.")
+            return None
+        return name
+    
+    def bookmark_version(self):
+        """Save the current ledger version under a name"""
+        name = simpledialog.askstring("Bookmark Version", "Name for this version:", parent=self.root)
+        if name:
+            self.history.bookmark(name.strip())
+    
+    def restore_bookmark(self):
+        """Make a bookmarked ledger version current again"""
+        name = self.ask_bookmark_name("Restore Bookmark")
+        if name:
+            self.show_version(self.history.restore_bookmark(name))
+    
+    def compare_with_bookmark(self):
+        """Show how the current ledger differs from a bookmarked version"""
+        name = self.ask_bookmark_name("Compare with Bookmark")
+        if not name:
+            return
+        
+        diff = self.history.compare(name)
+        
+        # The versions' own totals mix currencies, so convert both into the display currency
+        current = CurrencyTotals(self.rates)
+        current.rebuild(self.history.current.transactions)
+        income, expenses, missing = current.totals(self.display_currency)
+        bookmarked = CurrencyTotals(self.rates)
+        bookmarked.rebuild(self.history.bookmarks[name].transactions)
+        old_income, old_expenses, old_missing = bookmarked.totals(self.display_currency)
+        
+        currency = self.display_currency
+        missing = sorted(set(missing) | set(old_missing))
+        note = f"\n\nNo {currency} rates for {', '.join(missing)}; those amounts are left out." if missing else ""
+        messagebox.showinfo("Compare with Bookmark", 
+                           f"Current data compared with '{name}':\n\n"
+                           f"Transactions: {diff['transactions']:+d}\n"
+                           f"Total Income: {format_money(income - old_income, currency, signed=True)}\n"
+                           f"Total Expenses: {format_money(expenses - old_expenses, currency, signed=True)}\n"
+                           f"Net Balance: {format_money((income - expenses) - (old_income - old_expenses), currency, signed=True)}"
+                           f"{note}")
+    
+    def set_budget(self):
+        """Open the dialog for defining a budget"""
+        BudgetDialog(self.root, self.handle_budget_set)
+    
+    def handle_budget_set(self, transaction_type, category, month, limit):
+        """Store a budget defined in the dialog"""
+        self.budgets.set_budget(transaction_type, category, month, limit)
+        self.show_budget_alerts(self.budgets.alerts())
+    
+    def view_budgets(self):
+        """Show all budgets and how much of each has been used"""
+        status = self.budgets.status()
+        if not status:
+            messagebox.showinfo("Budgets", "No budgets have been set yet.")
+            return
+        
+        lines = [
+            f"{month}  {transaction_type} / {category}: "
+            f"{format_money(spent, self.budgets.currency)} of {format_money(limit, self.budgets.currency)}"
+            for transaction_type, category, month, limit, spent in status
+        ]
+        messagebox.showinfo("Budgets", "\n".join(lines))
+    
+    def edit_category_rules(self):
+        """Open the dialog for editing categorization rules"""
+        RulesDialog(self.root, self.categorizer.rules, self.handle_rules_set)
+    
+    def handle_rules_set(self, rules):
+        """Apply edited rules, re-categorizing only the affected transactions"""
+        if self.categorizer.set_rules(rules):
+            self.budgets.rebuild(self.transactions)
+            self.show_budget_alerts(self.budgets.alerts())
+            self.transaction_list.set_transactions(self.transactions)
+            self.charts.update_charts(self.transactions)
+    
+    def load_category_rules(self, rules):
+        """Use categorization rules read from a saved file"""
+        try:
+            self.categorizer.load_list(rules)
+        except (KeyError, TypeError, ValueError) as e:
+            messagebox.showwarning("Categorization Rules", f"The saved rules could not be used: {str(e)}")
+    
+    def currency_choices(self):
+        """Get the currencies offered for entry and display"""
+        return sorted(set(CURRENCY_SYMBOLS) | set(self.rates.currencies()))
+    
+    def update_currency_menu(self):
+        """List every known currency as a display currency choice"""
+        self.currency_menu.delete(2, "end")
+        for currency in self.currency_choices():
+            self.currency_menu.add_radiobutton(
+                label=f"Show Totals in {currency}",
+                variable=self.currency_var,
+                value=currency,
+                command=self.set_display_currency
+            )
+    
+    def set_display_currency(self):
+        """Show totals in the currency picked in the Currency menu"""
+        currency = self.currency_var.get()
+        self.display_currency = currency
+        self.animator.formatter = lambda cents: format_money(cents, currency)
+        
+        # Converted totals are memoized per currency, so switching back is a lookup
+        self.show_totals()
+        self.background_charts.set_currency(currency)
+    
+    def load_rate_table(self):
+        """Read a CSV file of daily exchange rates"""
+        changed = FileHandler.import_rate_table(self.rates)
+        if changed is None:
+            return
+        
+        # Only totals of currencies with new rates are converted again
+        self.currency_totals.rates_changed(changed)
+        self.update_currency_menu()
+        self.transaction_input.set_currencies(self.currency_choices())
+        self.show_totals()
+        
+        # Budgets and charts hold converted amounts as well
+        self.budgets.rebuild(self.transactions)
+        self.show_budget_alerts(self.budgets.alerts())
+        self.charts.update_charts(self.transactions)
+        
+        messagebox.showinfo("Rate Table", f"Updated rates for: {', '.join(sorted(changed)) or 'no currencies'}")
+    
+    def show_totals(self, previous_income=None, previous_expenses=None):
+        """Show the current totals in the display currency, animating from previous values when given"""
+        income, expenses, missing = self.currency_totals.totals(self.display_currency)
+        current = (
+            (self.income_label, previous_income, income),
+            (self.expense_label, previous_expenses, expenses),
+            (self.balance_label,
+             None if previous_income is None else previous_income - previous_expenses,
+             income - expenses),
+        )
+        for label, previous, value in current:
+            if previous is None:
+                self.animator.set(label, value)
+            elif previous != value:
+                self.animator.animate(label, previous, value)
+        
+        self.currency_alerts = [
+            f"No {currency} rates for {self.display_currency}; {currency} amounts are left out of the totals"
+            for currency in missing
+        ]
+        self.show_alerts()
+    
+    def show_budget_alerts(self, alerts):
+        """Show budget threshold alerts in the balance section"""
+        self.budget_alerts = alerts
+        self.show_alerts()
+    
+    def show_alerts(self):
+        """Show budget and currency alerts in the balance section"""
+        alerts = self.budget_alerts + self.currency_alerts
+        self.budget_label.config(text="\n".join(f"⚠ {alert}" for alert in alerts))
     
     def show_about(self):
         """Show about dialog"""
@@ -280,16 +870,57 @@ class PersonalFinanceTracker:
         - New: Clear all data and start fresh
         - Save: Save your financial data to a file
         - Load: Load previously saved financial data
+        - Open Ledger Folder: Open data saved as one file per month; older
+          months load when you scroll back or search their dates
+        - Save to Ledger Folder: Save your data as one file per month
         - Export to CSV: Export your transactions to a CSV file
         - Import from CSV: Import transactions from a CSV file
+        - Export to / Import from Arrow/Parquet: Compact typed files that
+          load quickly here and in data tools such as pandas
+        - Import Bank Statement: Import an OFX, QFX or QIF statement
+        - Generate Monthly/Annual Reports: Write PNG and PDF reports per period
+        - Ingestion Server: Accept transactions from local scripts as
+          newline-delimited JSON
         - Exit: Close the application
         
+        Edit Menu:
+        - Undo / Redo: Step through previous versions of your data
+        - Bookmark Version: Name the current version for later comparison
+        - Restore Bookmark: Return to a bookmarked version
+        - Compare with Bookmark: See how totals changed since a bookmark
+        
         Adding Transactions:
         1. Enter a description
-        2. Enter the amount
+        2. Enter the amount and pick its currency
         3. Select the transaction type (Income/Expense)
         4. Click "Add Transaction"
         
+        Budgets Menu:
+        - Set Budget: Set a limit for a type, category and month
+        - View Budgets: See how much of each budget has been used
+        
+        Currency Menu:
+        - Load Rate Table: Read daily exchange rates from a CSV file with
+          date, currency and rate columns (rate = value of one unit in USD)
+        - Show Totals in: Pick the currency your totals are shown in
+        
+        Categories Menu:
+        - Edit Rules: Categorize transactions automatically, one rule per line,
+          e.g. keyword: coffee => Food, prefix: AMZN => Shopping,
+          regex: ^uber\\b => Transport; earlier rules win
+        
+        Searching:
+        - Type plain text to match any column
+        - Filter by field, e.g. type:expense amount>100 date:2025-03..2025-06 desc:"coffee"
+        
+        Unusual Transactions:
+        - Rows are highlighted when an amount is far from what you usually
+          pay that merchant, or when the same charge repeats on the same day
+        
+        View Menu:
+        - Render Charts in Background: Draw charts without pausing typing;
+          turn off for interactive charts
+        
         Viewing Data:
         - The top section shows your total income, expenses, and net balance
         - The left panel shows your transaction history
@@ -454,6 +1085,18 @@ class PersonalFinanceTracker:
         ttk.Label(net_frame, text="Net Balance", style="Balance.TLabel").pack(side="left")
         self.balance_label = ttk.Label(net_frame, text="$0.00", style="PositiveBalance.TLabel")
         self.balance_label.pack(side="right", padx=10)
+        
+        # Budget alerts
+        self.budget_label = tk.Label(
+            inner_frame,
+            text="",
+            font=("Inter", 11),
+            justify="left",
+            anchor="w",
+            fg=self.theme.colors['warning'],
+            bg=self.theme.colors['card_bg']
+        )
+        self.budget_label.grid(row=1, column=0, columnspan=6, padx=10, pady=(10, 0), sticky="ew")
     
     def setup_main_content(self):
         """Setup main content area with transaction input and lists"""
@@ -466,8 +1109,18 @@ class PersonalFinanceTracker:
         left_content.pack(fill="both", expand=True)
         
         # Initialize transaction components
-        self.transaction_input = TransactionInput(left_content, self.handle_transaction_added)
-        self.transaction_list = TransactionList(left_content)
+        self.transaction_input = TransactionInput(
+            left_content,
+            self.handle_transaction_added,
+            currencies=self.currency_choices()
+        )
+        self.transaction_list = TransactionList(
+            left_content,
+            on_scroll_top=self.load_older_history,
+            on_date_range=self.load_history_range,
+            is_anomaly=self.anomalies.reason,
+            category_of=self.categorizer.category
+        )
         
         # Right column: Charts
         right_frame = ttk.Frame(self.main_container, style="Card.TFrame")
@@ -477,40 +1130,51 @@ class PersonalFinanceTracker:
         right_content = ttk.Frame(right_frame, style="Card.TFrame", padding=20)
         right_content.pack(fill="both", expand=True)
         
-        # Initialize charts
-        self.charts = FinancialCharts(right_content, self.theme.colors)
+        # Initialize both chart modes; only the active one is shown and updated
+        self.interactive_chart_frame = ttk.Frame(right_content, style="Card.TFrame")
+        self.background_chart_frame = ttk.Frame(right_content, style="Card.TFrame")
+        self.interactive_charts = FinancialCharts(self.interactive_chart_frame, self.theme.colors)
+        self.background_charts = BackgroundCharts(
+            self.background_chart_frame, self.theme.colors,
+            category_of=self.categorizer.category,
+            convert=self.rates.convert_amount,
+            currency=self.display_currency
+        )
+        self.toggle_background_charts()
+    
+    def toggle_background_charts(self):
+        """Switch between background-rendered and interactive charts"""
+        if self.background_charts_var.get():
+            shown, hidden, self.charts = self.background_chart_frame, self.interactive_chart_frame, self.background_charts
+        else:
+            shown, hidden, self.charts = self.interactive_chart_frame, self.background_chart_frame, self.interactive_charts
+        
+        hidden.pack_forget()
+        shown.pack(fill="both", expand=True)
+        self.charts.update_charts(self.transactions)
     
     def handle_transaction_added(self, transaction):
         """Handle new transaction added"""
         # Add to transactions list
         self.transactions.append(transaction)
+        self.history.append(transaction)
         
         # Update totals with animation
+        previous_income, previous_expenses, _ = self.currency_totals.totals(self.display_currency)
         if transaction['type'] == "Income":
-            ValueAnimator.animate_value_change(
-                self.root,
-                self.income_label,
-                self.total_income,
-                self.total_income + transaction['amount']
-            )
             self.total_income += transaction['amount']
         else:
-            ValueAnimator.animate_value_change(
-                self.root,
-                self.expense_label,
-                self.total_expenses,
-                self.total_expenses + transaction['amount']
-            )
             self.total_expenses += transaction['amount']
+        self.currency_totals.add([transaction])
+        self.show_totals(previous_income, previous_expenses)
         
-        # Update net balance
-        net_balance = self.total_income - self.total_expenses
-        ValueAnimator.animate_value_change(
-            self.root,
-            self.balance_label,
-            net_balance - transaction['amount'] if transaction['type'] == "Expense" else net_balance,
-            net_balance
-        )
+        # Categorize the transaction and count it against its budgets
+        self.categorizer.add([transaction])
+        if self.budgets.record(transaction):
+            self.show_budget_alerts(self.budgets.alerts())
+        
+        # Check the amount against the merchant's history
+        self.anomalies.observe(transaction)
         
         # Update transaction list
         self.transaction_list.add_transaction(transaction)
@@ -0,0 +1,107 @@
+import tkinter as tk
+from tkinter import ttk
+from PIL import Image, ImageTk
+from src.utils.chart_figures import REPORT_COLORS
+from src.utils.chart_renderer import ChartRenderer
+
+class BackgroundCharts:
+    """Summary charts drawn on a worker thread and shown as an image
+
+    Has the same update_charts() interface as FinancialCharts, but the Tk
+    thread only snapshots the data and pastes finished frames, so typing and
+    scrolling never wait for matplotlib.
+    """
+
+    def __init__(self, parent, colors, poll_interval=16, category_of=None, convert=None, currency=None):
+        self.poll_interval = poll_interval
+        # Currency the amounts are converted into with convert(transaction, currency)
+        self.currency = currency
+        self.transactions = []
+        self.photo = None
+        self.poll_id = None
+
+        # Dark theme colours for the charts, falling back to the report palette
+        background = colors.get('card_bg', REPORT_COLORS['background'])
+        self.renderer = ChartRenderer(dict(
+            REPORT_COLORS,
+            background=background,
+            text=colors.get('text', REPORT_COLORS['text']),
+            grid=colors.get('text_secondary', REPORT_COLORS['grid']),
+            balance=colors.get('primary', REPORT_COLORS['balance'])
+        ), category_of=category_of, convert=convert)
+
+        # Create frame for the chart image
+        self.frame = ttk.Frame(parent, style="Card.TFrame")
+        self.frame.pack(fill="both", expand=True)
+
+        # No padding, so an image of the label's size does not make it grow
+        self.image_label = tk.Label(
+            self.frame, bg=background, fg=colors.get('text', REPORT_COLORS['text']),
+            borderwidth=0, highlightthickness=0, padx=0, pady=0
+        )
+        self.image_label.pack(fill="both", expand=True)
+
+        # Redraw at the new size whenever the panel is resized
+        self.size = None
+        self.image_label.bind("<Configure>", self.resize)
+
+    def update_charts(self, transactions):
+        """Redraw the charts for new data without blocking the UI"""
+        self.transactions = transactions
+        self.request_render()
+
+    def set_currency(self, currency):
+        """Redraw with amounts converted into another currency"""
+        self.currency = currency
+        self.request_render()
+
+    def resize(self, event):
+        """Redraw when the panel size actually changes"""
+        if (event.width, event.height) != self.size:
+            self.request_render()
+
+    def request_render(self):
+        """Send a snapshot of the data to the renderer and watch for the frame"""
+        width = self.image_label.winfo_width()
+        height = self.image_label.winfo_height()
+        if width < 2 or height < 2:
+            # Not laid out yet; the first <Configure> event renders
+            return
+
+        self.size = (width, height)
+        self.renderer.submit(list(self.transactions), width, height, self.currency)
+        if self.poll_id is None:
+            self.poll_id = self.frame.after(self.poll_interval, self.poll)
+
+    def poll(self):
+        """Swap in a finished frame; keep polling only while a render is pending"""
+        self.poll_id = None
+        if self.renderer.take_frame(self.show_frame):
+            self.image_label.config(text="")
+        error = self.renderer.take_error()
+        if error is not None:
+            self.show_error(error)
+        if self.renderer.busy():
+            self.poll_id = self.frame.after(self.poll_interval, self.poll)
+
+    def show_frame(self, buffer, width, height):
+        """Copy an RGBA frame into the Tk image, reusing it while the size is unchanged"""
+        image = Image.frombuffer("RGBA", (width, height), buffer, "raw", "RGBA", 0, 1)
+        if self.photo is None or (self.photo.width(), self.photo.height()) != (width, height):
+            self.photo = ImageTk.PhotoImage(image)
+            self.image_label.config(image=self.photo)
+        else:
+            self.photo.paste(image)
+
+    def show_error(self, error):
+        """Replace the charts with a message when they could not be drawn"""
+        self.photo = None
+        self.image_label.config(image="", text=f"The charts could not be drawn: {error}")
+
+    def destroy(self):
+        """Stop rendering and remove the panel"""
+        if self.poll_id is not None:
+            self.frame.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.renderer.stop()
+        self.frame.destroy()
@@ -0,0 +1,107 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import datetime
+from src.utils.budget import ALL_CATEGORIES
+from src.utils.money import parse_cents
+from src.utils.currency import DEFAULT_CURRENCY
+
+class BudgetDialog:
+    """Dialog for defining a budget for a type, category and month"""
+
+    def __init__(self, parent, callback):
+        self.callback = callback
+
+        # Create dialog window
+        self.window = tk.Toplevel(parent)
+        self.window.title("Set Budget")
+        self.window.transient(parent)
+        self.window.resizable(False, False)
+
+        self.frame = ttk.Frame(self.window, style="Card.TFrame", padding=20)
+        self.frame.pack(fill="both", expand=True)
+
+        # Add title
+        title_label = ttk.Label(
+            self.frame,
+            text="Set Budget",
+            font=("Inter", 16, "bold"),
+            style="CardTitle.TLabel"
+        )
+        title_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 15))
+
+        # Transaction type
+        self.type_var = tk.StringVar(value="Expense")
+        self.add_field(1, "Type:", ttk.Combobox(
+            self.frame,
+            textvariable=self.type_var,
+            values=["Expense", "Income"],
+            state="readonly",
+            style="Input.TCombobox",
+            width=20
+        ))
+
+        # Category
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        self.add_field(2, "Category:", ttk.Entry(
+            self.frame,
+            textvariable=self.category_var,
+            style="Input.TEntry",
+            width=22
+        ))
+
+        # Month
+        self.month_var = tk.StringVar(value=datetime.date.today().strftime("%Y-%m"))
+        self.add_field(3, "Month (YYYY-MM):", ttk.Entry(
+            self.frame,
+            textvariable=self.month_var,
+            style="Input.TEntry",
+            width=22
+        ))
+
+        # Limit
+        self.limit_var = tk.StringVar()
+        limit_entry = ttk.Entry(
+            self.frame,
+            textvariable=self.limit_var,
+            style="Input.TEntry",
+            width=22
+        )
+        self.add_field(4, f"Limit ({DEFAULT_CURRENCY}, 0 to remove):", limit_entry)
+
+        # Save button
+        ttk.Button(
+            self.frame,
+            text="Save Budget",
+            style="Primary.TButton",
+            command=self.save
+        ).grid(row=5, column=0, columnspan=2, sticky="ew", pady=(15, 0))
+
+        limit_entry.focus()
+        self.window.grab_set()
+
+    def add_field(self, row, label, widget):
+        """Place a labelled input on the given row"""
+        ttk.Label(self.frame, text=label, style="InputLabel.TLabel").grid(row=row, column=0, sticky="w", padx=(0, 10), pady=5)
+        widget.grid(row=row, column=1, sticky="ew", pady=5)
+
+    def save(self):
+        """Validate the inputs and hand the budget to the callback"""
+        category = self.category_var.get().strip() or ALL_CATEGORIES
+        month = self.month_var.get().strip()
+
+        try:
+            datetime.datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter the month as YYYY-MM.", parent=self.window)
+            return
+
+        try:
+            limit = parse_cents(self.limit_var.get())
+            if limit < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter a valid limit.", parent=self.window)
+            return
+
+        self.callback(self.type_var.get(), category, month, limit)
+        self.window.destroy()
@@ -0,0 +1,63 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from src.utils.categorizer import parse_rules, format_rules, RuleError
+
+RULES_HINT = (
+    "One rule per line as  kind: pattern => Category\n"
+    "kind is keyword, prefix or regex; earlier rules win."
+)
+
+
+class RulesDialog:
+    """Dialog for editing the auto-categorization rules"""
+
+    def __init__(self, parent, rules, callback):
+        self.callback = callback
+
+        # Create dialog window
+        self.window = tk.Toplevel(parent)
+        self.window.title("Categorization Rules")
+        self.window.transient(parent)
+
+        self.frame = ttk.Frame(self.window, style="Card.TFrame", padding=20)
+        self.frame.pack(fill="both", expand=True)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(2, weight=1)
+
+        # Add title
+        title_label = ttk.Label(
+            self.frame,
+            text="Categorization Rules",
+            font=("Inter", 16, "bold"),
+            style="CardTitle.TLabel"
+        )
+        title_label.grid(row=0, column=0, sticky="w", pady=(0, 5))
+
+        ttk.Label(self.frame, text=RULES_HINT, style="InputLabel.TLabel").grid(row=1, column=0, sticky="w", pady=(0, 10))
+
+        # Rules editor
+        self.text = tk.Text(self.frame, width=60, height=15, font=("Consolas", 10), undo=True)
+        self.text.grid(row=2, column=0, sticky="nsew")
+        self.text.insert("1.0", format_rules(rules))
+
+        # Save button
+        ttk.Button(
+            self.frame,
+            text="Apply Rules",
+            style="Primary.TButton",
+            command=self.save
+        ).grid(row=3, column=0, sticky="ew", pady=(15, 0))
+
+        self.text.focus()
+        self.window.grab_set()
+
+    def save(self):
+        """Validate the rules and hand them to the callback"""
+        try:
+            rules = parse_rules(self.text.get("1.0", "end"))
+            self.callback(rules)
+        except RuleError as e:
+            messagebox.showerror("Rule Error", str(e), parent=self.window)
+            return
+
+        self.window.destroy()
@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
+from src.utils.money import parse_cents
+from src.utils.currency import DEFAULT_CURRENCY, CURRENCY_SYMBOLS, currency_of, format_money
+from src.utils.query import compile_query, LedgerIndex, QueryError
+
+# Milliseconds of idle typing before a searched date range reads older history
+RANGE_LOAD_DELAY = 600
 
 class TransactionInput:
     """Component for inputting new transactions"""
     
-    def __init__(self, parent, callback):
+    def __init__(self, parent, callback, currencies=None):
         self.parent = parent
         self.callback = callback
         
@@ -20,13 +26,14 @@ class TransactionInput:
             font=("Inter", 16, "bold"),
             style="CardTitle.TLabel"
         )
-        title_label.grid(row=0, column=0, columnspan=4, sticky="w", padx=15, pady=(15, 20))
+        title_label.grid(row=0, column=0, columnspan=5, sticky="w", padx=15, pady=(15, 20))
         
         # Configure grid columns
         self.frame.columnconfigure(0, weight=1)  # Description
         self.frame.columnconfigure(1, weight=1)  # Amount
-        self.frame.columnconfigure(2, weight=1)  # Type
-        self.frame.columnconfigure(3, weight=1)  # Button
+        self.frame.columnconfigure(2, weight=1)  # Currency
+        self.frame.columnconfigure(3, weight=1)  # Type
+        self.frame.columnconfigure(4, weight=1)  # Button
         
         # Description input
         desc_label = ttk.Label(self.frame, text="Description:", style="InputLabel.TLabel")
@@ -42,7 +49,7 @@ class TransactionInput:
         self.description_entry.grid(row=2, column=0, sticky="ew", padx=15, pady=(0, 15))
         
         # Amount input
-        amount_label = ttk.Label(self.frame, text="Amount ($):", style="InputLabel.TLabel")
+        amount_label = ttk.Label(self.frame, text="Amount:", style="InputLabel.TLabel")
         amount_label.grid(row=1, column=1, sticky="w", padx=15, pady=(0, 5))
         
         self.amount_var = tk.StringVar()
@@ -54,9 +61,24 @@ class TransactionInput:
         )
         self.amount_entry.grid(row=2, column=1, sticky="ew", padx=15, pady=(0, 15))
         
+        # Currency
+        currency_label = ttk.Label(self.frame, text="Currency:", style="InputLabel.TLabel")
+        currency_label.grid(row=1, column=2, sticky="w", padx=15, pady=(0, 5))
+        
+        self.currency_var = tk.StringVar(value=DEFAULT_CURRENCY)
+        self.currency_combo = ttk.Combobox(
+            self.frame, 
+            textvariable=self.currency_var,
+            values=currencies or list(CURRENCY_SYMBOLS),
+            state="readonly",
+            style="Input.TCombobox",
+            width=8
+        )
+        self.currency_combo.grid(row=2, column=2, sticky="ew", padx=15, pady=(0, 15))
+        
         # Transaction type
         type_label = ttk.Label(self.frame, text="Type:", style="InputLabel.TLabel")
-        type_label.grid(row=1, column=2, sticky="w", padx=15, pady=(0, 5))
+        type_label.grid(row=1, column=3, sticky="w", padx=15, pady=(0, 5))
         
         self.type_var = tk.StringVar(value="Income")
         self.type_combo = ttk.Combobox(
@@ -67,7 +89,7 @@ class TransactionInput:
             style="Input.TCombobox",
             width=15
         )
-        self.type_combo.grid(row=2, column=2, sticky="ew", padx=15, pady=(0, 15))
+        self.type_combo.grid(row=2, column=3, sticky="ew", padx=15, pady=(0, 15))
         
         # Add button
         self.add_button = ttk.Button(
@@ -76,7 +98,7 @@ class TransactionInput:
             style="Primary.TButton",
             command=self.add_transaction
         )
-        self.add_button.grid(row=2, column=3, sticky="ew", padx=15, pady=(0, 15))
+        self.add_button.grid(row=2, column=4, sticky="ew", padx=15, pady=(0, 15))
     
     def add_transaction(self):
         """Add a new transaction"""
@@ -91,7 +113,7 @@ class TransactionInput:
             return
         
         try:
-            amount = float(amount_str)
+            amount = parse_cents(amount_str)
             if amount <= 0:
                 messagebox.showerror("Input Error", "Amount must be greater than zero.")
                 return
@@ -104,7 +126,8 @@ class TransactionInput:
             "date": datetime.datetime.now().strftime("%Y-%m-%d"),
             "description": description,
             "amount": amount,
-            "type": transaction_type
+            "type": transaction_type,
+            "currency": self.currency_var.get()
         }
         
         # Call the callback function
@@ -117,15 +140,35 @@ class TransactionInput:
         
         # Set focus back to description
         self.description_entry.focus()
+    
+    def set_currencies(self, currencies):
+        """Update the currencies offered for new transactions"""
+        self.currency_combo.config(values=currencies)
 
 
 class TransactionList:
     """Component for displaying transaction history"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, on_scroll_top=None, on_date_range=None, is_anomaly=None, category_of=None):
         self.parent = parent
         self.transactions = []
         
+        # Optional hooks for fetching older history on demand
+        self.on_scroll_top = on_scroll_top
+        self.on_date_range = on_date_range
+        
+        # Optional check that marks unusual transactions
+        self.is_anomaly = is_anomaly
+        
+        # Optional lookup of categories assigned by rules
+        self.category_of = category_of or (lambda transaction: transaction.get("category"))
+        
+        # Search index, built on the first structured query
+        self.index = None
+        
+        # Pending after() call that reads history for the searched date range
+        self.range_load_id = None
+        
         # Create frame for transaction list
         self.frame = ttk.Frame(parent, style="Card.TFrame")
         self.frame.pack(fill="both", expand=True)
@@ -149,7 +192,7 @@ class TransactionList:
         
         # Add search entry
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self.filter_transactions)
+        self.search_var.trace("w", self.search_changed)
         search_entry = ttk.Entry(
             search_frame, 
             textvariable=self.search_var,
@@ -157,6 +200,7 @@ class TransactionList:
             width=30
         )
         search_entry.pack(side="left", fill="x", expand=True)
+        search_entry.bind("<Return>", self.load_search_range)
         
         # Create container for treeview and scrollbar
         tree_container = ttk.Frame(self.frame, style="Card.TFrame")
@@ -199,7 +243,7 @@ class TransactionList:
         # Create treeview for transactions
         self.tree = ttk.Treeview(
             tree_container,
-            columns=("date", "description", "type", "amount"),
+            columns=("date", "description", "type", "category", "amount"),
             show="headings",
             style="TransactionTree.Treeview",
             height=10
@@ -209,21 +253,32 @@ class TransactionList:
         self.tree.heading("date", text="Date")
         self.tree.heading("description", text="Description")
         self.tree.heading("type", text="Type")
+        self.tree.heading("category", text="Category")
         self.tree.heading("amount", text="Amount")
         
         self.tree.column("date", width=100, anchor="w")
         self.tree.column("description", width=250, anchor="w")
         self.tree.column("type", width=100, anchor="center")
+        self.tree.column("category", width=120, anchor="w")
         self.tree.column("amount", width=100, anchor="e")
         
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
+        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.scroll)
         self.tree.configure(yscrollcommand=scrollbar.set)
         
+        # Scrolling up past the first row asks for older history
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_up() if event.delta > 0 else None)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_up())
+        
         # Pack treeview and scrollbar
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Configure row tags once for all inserted rows
+        self.tree.tag_configure("income", foreground="#10B981")
+        self.tree.tag_configure("expense", foreground="#EF4444")
+        self.tree.tag_configure("anomaly", background="#78350F")
+        
         # Show placeholder message if no transactions
         self.show_placeholder()
     
@@ -231,45 +286,44 @@ class TransactionList:
         """Show placeholder message if no transactions"""
         if not self.transactions:
             # Clear any existing placeholder
-            for item in self.tree.get_children():
-                if item.startswith("placeholder"):
-                    self.tree.delete(item)
+            if self.tree.exists("placeholder"):
+                self.tree.delete("placeholder")
             
             # Add placeholder message
-            self.tree.insert("", "end", iid="placeholder", values=("", "No transactions yet. Add a new transaction to get started.", "", ""))
+            self.tree.insert("", "end", iid="placeholder", values=("", "No transactions yet. Add a new transaction to get started.", "", "", ""))
     
-    def add_transaction(self, transaction, update_ui=True):
-        """Add a transaction to the list"""
-        # Add to internal list
-        self.transactions.append(transaction)
-        
-        # Clear placeholder if it exists
-        for item in self.tree.get_children():
-            if item.startswith("placeholder"):
-                self.tree.delete(item)
+    def insert_row(self, transaction):
+        """Insert a single transaction row with its type tag"""
+        tags = ("income",) if transaction["type"] == "Income" else ("expense",)
+        if self.is_anomaly and self.is_anomaly(transaction):
+            tags += ("anomaly",)
         
-        # Format amount with currency symbol
-        formatted_amount = f"${transaction['amount']:.2f}"
-        
-        # Add to treeview
-        item_id = self.tree.insert(
+        return self.tree.insert(
             "",
             "end",
             values=(
                 transaction["date"],
                 transaction["description"],
                 transaction["type"],
-                formatted_amount
-            )
+                self.category_of(transaction) or "",
+                format_money(transaction["amount"], currency_of(transaction))
+            ),
+            tags=tags
         )
+    
+    def add_transaction(self, transaction, update_ui=True):
+        """Add a transaction to the list"""
+        # Add to internal list
+        self.transactions.append(transaction)
+        if self.index is not None:
+            self.index.add(transaction)
         
-        # Apply tag based on transaction type
-        if transaction["type"] == "Income":
-            self.tree.tag_configure("income", foreground="#10B981")
-            self.tree.item(item_id, tags=("income",))
-        else:
-            self.tree.tag_configure("expense", foreground="#EF4444")
-            self.tree.item(item_id, tags=("expense",))
+        # Clear placeholder if it exists
+        if self.tree.exists("placeholder"):
+            self.tree.delete("placeholder")
+        
+        # Add to treeview
+        item_id = self.insert_row(transaction)
         
         # Scroll to the new item
         if update_ui:
@@ -278,65 +332,128 @@ class TransactionList:
             # Update search filter
             self.filter_transactions()
     
+    def add_transactions(self, transactions):
+        """Add a batch of transactions and refresh the view once"""
+        transactions = list(transactions)
+        if not transactions:
+            return
+        
+        self.transactions.extend(transactions)
+        if self.index is not None:
+            self.index.add_all(transactions)
+        
+        # An active search rebuilds the view from the full list anyway
+        if self.search_var.get():
+            self.filter_transactions()
+            return
+        
+        # Drop placeholder or stale no-match rows before appending
+        for item in ("placeholder", "no_matches"):
+            if self.tree.exists(item):
+                self.tree.delete(item)
+        
+        insert_row = self.insert_row
+        for transaction in transactions:
+            insert_row(transaction)
+    
+    def set_transactions(self, transactions):
+        """Replace all transactions with a new batch"""
+        self.transactions = []
+        self.index = None
+        self.tree.delete(*self.tree.get_children())
+        self.add_transactions(transactions)
+        self.show_placeholder()
+    
+    def scroll(self, *args):
+        """Scroll the list from the scrollbar"""
+        self.tree.yview(*args)
+        if self.tree.yview()[0] <= 0:
+            self.scroll_up()
+    
+    def scroll_up(self):
+        """Request older history when the list is already at the top"""
+        if self.on_scroll_top and self.tree.yview()[0] <= 0:
+            self.on_scroll_top()
+    
+    def scroll_to_fraction(self, fraction):
+        """Keep the view away from the top after older rows were prepended"""
+        self.tree.yview_moveto(fraction)
+    
+    def get_index(self):
+        """Get the search index, building it if needed"""
+        if self.index is None:
+            self.index = LedgerIndex(self.transactions, self.category_of)
+        return self.index
+    
+    def search_changed(self, *args):
+        """Filter as the query is typed; read older history only once typing pauses"""
+        self.cancel_range_load()
+        self.filter_transactions()
+        if self.on_date_range:
+            self.range_load_id = self.frame.after(RANGE_LOAD_DELAY, self.load_search_range)
+    
+    def cancel_range_load(self):
+        """Drop a pending read of the searched date range"""
+        if self.range_load_id is not None:
+            self.frame.after_cancel(self.range_load_id)
+            self.range_load_id = None
+    
+    def load_search_range(self, event=None):
+        """Read archived months covered by the query's date range"""
+        self.cancel_range_load()
+        if not self.on_date_range:
+            return
+        
+        try:
+            bounds = compile_query(self.search_var.get().strip()).date_bounds()
+        except QueryError:
+            return
+        
+        # The list is refreshed (and filtered again) when months are read
+        if bounds:
+            self.on_date_range(*bounds)
+    
     def filter_transactions(self, *args):
         """Filter transactions based on search query"""
-        search_term = self.search_var.get().lower()
+        search_term = self.search_var.get().strip()
         
         # Clear treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
         # If no transactions, show placeholder
         if not self.transactions:
             self.show_placeholder()
             return
         
-        # Filter and add matching transactions
-        has_matches = False
-        for transaction in self.transactions:
-            # Check if transaction matches search term
-            if (search_term in transaction["description"].lower() or
-                search_term in transaction["date"].lower() or
-                search_term in transaction["type"].lower() or
-                search_term in str(transaction["amount"])):
-                
-                # Format amount with currency symbol
-                formatted_amount = f"${transaction['amount']:.2f}"
-                
-                # Add to treeview
-                item_id = self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        transaction["date"],
-                        transaction["description"],
-                        transaction["type"],
-                        formatted_amount
-                    )
-                )
-                
-                # Apply tag based on transaction type
-                if transaction["type"] == "Income":
-                    self.tree.tag_configure("income", foreground="#10B981")
-                    self.tree.item(item_id, tags=("income",))
-                else:
-                    self.tree.tag_configure("expense", foreground="#EF4444")
-                    self.tree.item(item_id, tags=("expense",))
-                
-                has_matches = True
+        # Without a query every transaction matches
+        if not search_term:
+            for transaction in self.transactions:
+                self.insert_row(transaction)
+            return
+        
+        # Compile the query and run it through the index
+        try:
+            query = compile_query(search_term)
+        except QueryError as e:
+            self.tree.insert("", "end", iid="no_matches", values=("", f"Invalid search: {e}", "", "", ""))
+            return
+        
+        positions = query.execute(self.get_index())
+        for position in positions:
+            self.insert_row(self.transactions[position])
         
         # Show no matches message if needed
-        if not has_matches:
-            self.tree.insert("", "end", iid="no_matches", values=("", f"No transactions matching '{search_term}'", "", ""))
+        if not positions:
+            self.tree.insert("", "end", iid="no_matches", values=("", f"No transactions matching '{search_term}'", "", "", ""))
     
     def clear_transactions(self):
         """Clear all transactions"""
         # Clear internal list
         self.transactions = []
+        self.index = None
         
         # Clear treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
         # Show placeholder
         self.show_placeholder()
@@ -0,0 +1,73 @@
+import time
+from src.utils.money import format_cents
+
+
+class AnimationScheduler:
+    """Single frame loop that animates numeric labels towards their targets
+
+    Each label has at most one animation. A new value retargets the running
+    animation from wherever it currently is instead of starting another
+    loop, so any number of updates costs one after() callback per frame, and
+    nothing is scheduled while all labels are at rest.
+    """
+
+    def __init__(self, root, duration=300, frame_interval=16, formatter=format_cents):
+        self.root = root
+        self.duration = duration / 1000
+        self.frame_interval = frame_interval
+        self.formatter = formatter
+
+        # label -> [start value, current value, target value, start time]
+        self.animations = {}
+        self.frame_id = None
+
+    def animate(self, label, start, target):
+        """
+        Animate a label towards a new value
+
+        Args:
+            label: Tk/ttk label whose text is updated
+            start (int): Value shown before the change, used when the label
+                is not already animating
+            target (int): Value to finish at
+        """
+        state = self.animations.get(label)
+        if state is not None:
+            start = state[1]
+
+        self.animations[label] = [start, start, target, time.monotonic()]
+        if self.frame_id is None:
+            self.frame_id = self.root.after(self.frame_interval, self.frame)
+
+    def set(self, label, value):
+        """Show a value immediately, cancelling any animation on the label"""
+        self.animations.pop(label, None)
+        label.config(text=self.formatter(value))
+        if not self.animations:
+            self.cancel()
+
+    def cancel(self):
+        """Stop the frame loop"""
+        if self.frame_id is not None:
+            self.root.after_cancel(self.frame_id)
+            self.frame_id = None
+
+    def frame(self):
+        """Advance every running animation by one frame"""
+        self.frame_id = None
+        now = time.monotonic()
+
+        for label, state in list(self.animations.items()):
+            start, _, target, started = state
+            progress = min(1.0, (now - started) / self.duration) if self.duration else 1.0
+
+            # Ease out so large jumps settle smoothly
+            eased = 1 - (1 - progress) ** 3
+            state[1] = start + (target - start) * eased
+            label.config(text=self.formatter(round(state[1])))
+
+            if progress >= 1.0:
+                del self.animations[label]
+
+        if self.animations:
+            self.frame_id = self.root.after(self.frame_interval, self.frame)
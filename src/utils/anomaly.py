@@ -0,0 +1,141 @@
+import math
+import re
+from bisect import bisect_left, insort
+from collections import deque
+from src.utils.currency import currency_of
+
+# Amounts kept per merchant for the quantile fences and duplicate checks
+WINDOW_SIZE = 32
+
+# Transactions needed for a merchant before any amount is judged
+MIN_HISTORY = 8
+
+# An outlier is this many standard deviations from the mean...
+Z_THRESHOLD = 3.0
+
+# ...and this many interquartile ranges outside the recent quartiles
+IQR_FACTOR = 3.0
+
+# Store numbers, card suffixes and punctuation that vary between charges
+NOISE_PATTERN = re.compile(r"[\d#*_.,:;/\\-]+")
+
+
+def normalize_description(description):
+    """Reduce a description to a merchant key, e.g. 'AMZN Mktp US*2K4' -> 'amzn mktp us k'"""
+    return " ".join(NOISE_PATTERN.sub(" ", description.lower()).split())
+
+
+class MerchantStats:
+    """Running statistics of one merchant and transaction type
+
+    Mean and variance are kept with Welford's method over every amount;
+    quartiles come from a sorted copy of the most recent amounts, so memory
+    per merchant is bounded. The recent window also remembers which of its
+    transactions were flagged and why.
+    """
+
+    __slots__ = ("count", "mean", "m2", "recent", "sorted_recent")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.recent = deque()
+        self.sorted_recent = []
+
+    def add(self, transaction, reason=None):
+        amount = transaction["amount"]
+        self.count += 1
+        delta = amount - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (amount - self.mean)
+
+        self.recent.append((transaction, reason))
+        insort(self.sorted_recent, amount)
+        if len(self.recent) > WINDOW_SIZE:
+            old_transaction, _ = self.recent.popleft()
+            del self.sorted_recent[bisect_left(self.sorted_recent, old_transaction["amount"])]
+
+    def reason(self, transaction):
+        """Get why a transaction in the recent window was flagged, or None"""
+        for recent, reason in self.recent:
+            if recent is transaction:
+                return reason
+        return None
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, fraction):
+        values = self.sorted_recent
+        return values[round(fraction * (len(values) - 1))]
+
+
+class AnomalyDetector:
+    """Flags unusual transactions as they arrive, per merchant and type
+
+    A transaction is judged against the history of its merchant before it is
+    added to it. Amounts far from both the long-run mean and the recent
+    quartiles are flagged, as are repeats of a recent charge on the same day.
+    Flags are kept in each merchant's recent window, so memory stays bounded
+    by the number of merchants and older transactions lose their flag once
+    the merchant has moved on.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def observe(self, transaction):
+        """
+        Check a new transaction and add it to its merchant's statistics
+
+        Args:
+            transaction (dict): The transaction that was added
+
+        Returns:
+            str: Why the transaction is unusual, or None
+        """
+        key = self._key(transaction)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = MerchantStats()
+
+        reason = self._check(stats, transaction["date"], transaction["amount"])
+        stats.add(transaction, reason)
+        return reason
+
+    def rebuild(self, transactions):
+        """Recompute all statistics for a whole ledger, e.g. after a load or undo"""
+        self.stats = {}
+        for transaction in transactions:
+            self.observe(transaction)
+
+    def reason(self, transaction):
+        """Get why a recent transaction was flagged, or None if it was not"""
+        stats = self.stats.get(self._key(transaction))
+        return stats.reason(transaction) if stats else None
+
+    @staticmethod
+    def _key(transaction):
+        return normalize_description(transaction["description"]), transaction["type"], currency_of(transaction)
+
+    @staticmethod
+    def _check(stats, date, amount):
+        if any(recent["date"] == date and recent["amount"] == amount for recent, _ in stats.recent):
+            return "Possible duplicate charge"
+
+        if stats.count < MIN_HISTORY:
+            return None
+
+        std = stats.std()
+        if std and abs(amount - stats.mean) < Z_THRESHOLD * std:
+            return None
+
+        low = stats.quantile(0.25)
+        high = stats.quantile(0.75)
+        spread = IQR_FACTOR * (high - low)
+        if amount > high + spread:
+            return "Unusually high amount"
+        if amount < low - spread:
+            return "Unusually low amount"
+        return None
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from src.utils.currency import DEFAULT_CURRENCY, format_money
+
+# Category name that matches every transaction of a type
+ALL_CATEGORIES = "All"
+UNCATEGORIZED = "Uncategorized"
+
+# Fractions of a budget that trigger an alert when first crossed
+ALERT_THRESHOLDS = (0.8, 1.0)
+
+
+def category_of(transaction):
+    """Get the category a transaction carries itself"""
+    return transaction.get("category")
+
+
+def month_of(transaction):
+    """Get the YYYY-MM month of a transaction"""
+    return transaction["date"][:7]
+
+
+class BudgetEngine:
+    """Budgets per type, category and month with incrementally kept totals
+
+    Consumption is counted for every (type, category, month) as transactions
+    arrive, so checking a budget is a dictionary lookup that does not depend
+    on the size of the ledger. Limits and consumption are in one budget
+    currency; amount_of converts each transaction into it and returns None
+    for amounts that cannot be converted, which are not counted.
+    """
+
+    def __init__(self, category_of=category_of, amount_of=None, currency=DEFAULT_CURRENCY):
+        # Lookup of a transaction's category, e.g. one that also applies rules
+        self.category_of = category_of
+        self.amount_of = amount_of or (lambda transaction: transaction["amount"])
+        self.currency = currency
+        self.budgets = {}
+        self.spent = defaultdict(int)
+
+    def set_budget(self, transaction_type, category, month, limit):
+        """
+        Define or update a budget
+
+        Args:
+            transaction_type (str): "Income" or "Expense"
+            category (str): Category name, or ALL_CATEGORIES
+            month (str): Month as YYYY-MM
+            limit (int): Limit in cents; zero or less removes the budget
+        """
+        key = (transaction_type, category or ALL_CATEGORIES, month)
+        if limit > 0:
+            self.budgets[key] = limit
+        else:
+            self.budgets.pop(key, None)
+
+    def record(self, transaction):
+        """
+        Count a new transaction against its budgets
+
+        Args:
+            transaction (dict): The transaction that was added
+
+        Returns:
+            list: Alert messages for thresholds crossed by this transaction
+        """
+        alerts = []
+        amount = self.amount_of(transaction)
+        if amount is None:
+            return alerts
+        month = month_of(transaction)
+        categories = (self.category_of(transaction) or UNCATEGORIZED, ALL_CATEGORIES)
+
+        for category in categories:
+            key = (transaction["type"], category, month)
+            before = self.spent[key]
+            self.spent[key] = before + amount
+
+            limit = self.budgets.get(key)
+            if limit is not None:
+                alert = self._crossed_alert(key, limit, before, before + amount)
+                if alert:
+                    alerts.append(alert)
+
+        return alerts
+
+    def rebuild(self, transactions):
+        """Recount all consumption in one pass after a load or import"""
+        spent = defaultdict(int)
+        category_of = self.category_of
+        amount_of = self.amount_of
+        for transaction in transactions:
+            amount = amount_of(transaction)
+            if amount is None:
+                continue
+            month = month_of(transaction)
+            spent[(transaction["type"], category_of(transaction) or UNCATEGORIZED, month)] += amount
+            spent[(transaction["type"], ALL_CATEGORIES, month)] += amount
+        self.spent = spent
+
+    def _crossed_alert(self, key, limit, before, after):
+        for threshold in reversed(ALERT_THRESHOLDS):
+            if before < limit * threshold <= after:
+                return self._describe(key, limit, after)
+        return None
+
+    def _describe(self, key, limit, spent):
+        transaction_type, category, month = key
+        if spent > limit:
+            state = f"over by {format_money(spent - limit, self.currency)}"
+        else:
+            state = f"{spent * 100 // limit}% used"
+        return (f"{transaction_type} budget '{category}' for {month}: "
+                f"{format_money(spent, self.currency)} of {format_money(limit, self.currency)} ({state})")
+
+    def status(self):
+        """
+        Get the state of every budget
+
+        Returns:
+            list: (type, category, month, limit, spent) tuples sorted by month
+        """
+        return sorted(
+            (key + (limit, self.spent.get(key, 0)) for key, limit in self.budgets.items()),
+            key=lambda item: (item[2], item[0], item[1])
+        )
+
+    def alerts(self):
+        """Get alert messages for every budget currently past a threshold"""
+        return [
+            self._describe((transaction_type, category, month), limit, spent)
+            for transaction_type, category, month, limit, spent in self.status()
+            if spent >= limit * ALERT_THRESHOLDS[0]
+        ]
+
+    def to_list(self):
+        """Serialize budget definitions for saving"""
+        return [
+            {"type": transaction_type, "category": category, "month": month, "limit": limit}
+            for (transaction_type, category, month), limit in self.budgets.items()
+        ]
+
+    def load_list(self, budgets):
+        """Replace budget definitions with saved ones"""
+        self.budgets = {}
+        for budget in budgets:
+            self.set_budget(budget["type"], budget["category"], budget["month"], budget["limit"])
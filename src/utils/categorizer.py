@@ -0,0 +1,333 @@
+import re
+from collections import deque, namedtuple
+
+RULE_KINDS = ("keyword", "prefix", "regex")
+
+# A rule maps descriptions to a category; earlier rules win over later ones
+Rule = namedtuple("Rule", ["kind", "pattern", "category"])
+
+RULE_LINE = re.compile(r"^\s*(?P<kind>\w+)\s*:\s*(?P<pattern>.+?)\s*=>\s*(?P<category>.+?)\s*$")
+
+# Numbered backreferences and group conditionals, which change meaning once
+# a pattern's groups are renumbered inside a joined alternation
+GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?\(")
+
+# Inline global flags such as (?i), which are only allowed at the very start
+# of a pattern and would apply to every rule of a joined alternation
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+class RuleError(ValueError):
+    """Raised when a categorization rule is invalid"""
+
+
+def parse_rules(text):
+    """
+    Parse rules written one per line as ``kind: pattern => Category``
+
+    Blank lines and lines starting with # are ignored.
+
+    Args:
+        text (str): The rules text
+
+    Returns:
+        list: Parsed rules in priority order
+
+    Raises:
+        RuleError: If a line is malformed
+    """
+    rules = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        match = RULE_LINE.match(line)
+        if not match:
+            raise RuleError(f"Line {line_number}: expected 'kind: pattern => Category'")
+        rules.append(Rule(match.group("kind").lower(), match.group("pattern"), match.group("category")))
+    return rules
+
+
+def format_rules(rules):
+    """Write rules back in the format read by parse_rules"""
+    return "\n".join(f"{rule.kind}: {rule.pattern} => {rule.category}" for rule in rules)
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher; finds every pattern in one pass"""
+
+    def __init__(self, patterns):
+        # Trie as parallel lists: transitions, failure links and outputs
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for value, pattern in patterns:
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = next_node
+            self.output[node].append((value, len(pattern)))
+
+        # Breadth-first pass to link each node to its longest proper suffix
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+    def search(self, text):
+        """
+        Find all patterns in a text
+
+        Yields:
+            tuple: (value, start position) for every occurrence
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for value, length in output[node]:
+                yield value, position - length + 1
+
+
+class Categorizer:
+    """Compiled rule set that classifies a description in one pass
+
+    Keyword and prefix rules share one Aho-Corasick automaton, and all regex
+    rules are joined into one alternation used as a pre-filter, so the cost
+    of classifying a description barely depends on the number of rules.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+        literals = []
+        regexes = []
+        for index, rule in enumerate(self.rules):
+            if rule.kind not in RULE_KINDS:
+                raise RuleError(f"Rule {index + 1}: unknown kind '{rule.kind}', expected keyword, prefix or regex")
+            if not rule.pattern or not rule.category:
+                raise RuleError(f"Rule {index + 1}: pattern and category are required")
+            if rule.kind == "regex":
+                try:
+                    regexes.append((index, re.compile(rule.pattern, re.IGNORECASE)))
+                except re.error as e:
+                    raise RuleError(f"Rule {index + 1}: invalid regex: {e}") from None
+            else:
+                literals.append((index, rule.pattern.lower()))
+
+        self.matcher = AhoCorasick(literals)
+        self.regexes = regexes
+        self.combined = None
+        if regexes and all(self._joinable(pattern) for _, pattern in regexes):
+            try:
+                self.combined = re.compile(
+                    "|".join(f"(?:{pattern.pattern})" for _, pattern in regexes),
+                    re.IGNORECASE
+                )
+            except re.error:
+                # Anything else that only compiles on its own; test the rules one by one
+                self.combined = None
+
+    @staticmethod
+    def _joinable(pattern):
+        """Whether a regex matches the same text inside the joined alternation"""
+        # Named groups may clash across rules, group references would point
+        # at another rule's groups and global flags would leak into every
+        # rule; such rule sets are tested one by one
+        return (not pattern.groupindex and not GROUP_REFERENCE.search(pattern.pattern)
+                and not GLOBAL_FLAGS.search(pattern.pattern))
+
+    def match(self, description):
+        """
+        Find the highest priority rule matching a description
+
+        Args:
+            description (str): Transaction description
+
+        Returns:
+            int: Index of the winning rule, or None
+        """
+        best = None
+        rules = self.rules
+
+        if self.matcher:
+            for index, start in self.matcher.search(description.lower()):
+                if best is not None and index >= best:
+                    continue
+                if start == 0 or rules[index].kind == "keyword":
+                    best = index
+
+        if self.regexes and (self.combined is None or self.combined.search(description)):
+            for index, pattern in self.regexes:
+                if best is not None and index >= best:
+                    break
+                if pattern.search(description):
+                    best = index
+                    break
+
+        return best
+
+
+class AutoCategorizer:
+    """Applies categorization rules to a ledger, caching per description
+
+    Transactions are grouped by description, so each distinct description is
+    classified once, and changing the rules only revisits descriptions whose
+    result can actually change.
+
+    Rule categories are kept in a cache keyed by description and never
+    written into the transactions, which are shared with older ledger
+    versions; a category the transaction already carries (e.g. from an
+    imported statement) always wins over the rules.
+    """
+
+    def __init__(self, rules=()):
+        self.categorizer = Categorizer(rules)
+        self.results = {}
+        self.groups = {}
+        # description -> category of the winning rule, for matched descriptions only
+        self.categories = {}
+
+    @property
+    def rules(self):
+        return self.categorizer.rules
+
+    def to_list(self):
+        """Get the rules in a JSON-friendly form"""
+        return [rule._asdict() for rule in self.rules]
+
+    def load_list(self, rules):
+        """Replace the rules with ones read by to_list"""
+        self.set_rules([Rule(rule["kind"], rule["pattern"], rule["category"]) for rule in rules])
+
+    def category(self, transaction):
+        """
+        Get the category of a transaction
+
+        Returns:
+            str: Its own category, else the category of the winning rule, or None
+        """
+        return transaction.get("category") or self.categories.get(transaction["description"])
+
+    def categorized(self, transactions):
+        """Get copies of rule-categorized transactions with the category filled in, e.g. for other processes"""
+        categories = self.categories
+        return [
+            transaction if transaction.get("category") or transaction["description"] not in categories
+            else dict(transaction, category=categories[transaction["description"]])
+            for transaction in transactions
+        ]
+
+    def _classify(self, description):
+        result = self.results.get(description, -1)
+        if result == -1:
+            result = self.categorizer.match(description)
+            self.results[description] = result
+            if result is not None:
+                self.categories[description] = self.rules[result].category
+        return result
+
+    def add(self, transactions):
+        """Categorize newly added transactions"""
+        for transaction in transactions:
+            description = transaction["description"]
+            self.groups.setdefault(description, []).append(transaction)
+            self._classify(description)
+
+    def rebuild(self, transactions):
+        """Categorize a whole ledger, e.g. after a load or import"""
+        self.groups = {}
+        self.add(transactions)
+
+    def set_rules(self, rules):
+        """
+        Replace the rule set and re-categorize only affected descriptions
+
+        Args:
+            rules (list): New rules in priority order
+
+        Returns:
+            int: Number of transactions whose category changed
+
+        Raises:
+            RuleError: If a rule is invalid; the current rules stay in place
+        """
+        new_categorizer = Categorizer(rules)
+        old_rules = self.rules
+        new_rules = new_categorizer.rules
+
+        old_set = set(old_rules)
+        new_set = set(new_rules)
+        added = [rule for rule in new_rules if rule not in old_set]
+        kept_old = [rule for rule in old_rules if rule in new_set]
+        kept_new = [rule for rule in new_rules if rule in old_set]
+
+        if kept_old != kept_new:
+            # Surviving rules were reordered, so any winner may change
+            affected = set(self.groups)
+        else:
+            # Descriptions won by a removed rule, plus any an added rule matches
+            affected = {
+                description for description in self.groups
+                if self.results.get(description, -1) not in (-1, None)
+                and old_rules[self.results[description]] not in new_set
+            }
+            if added:
+                probe = Categorizer(added)
+                affected.update(
+                    description for description in self.groups
+                    if probe.match(description) is not None
+                )
+
+        old_results = {description: self.results.get(description) for description in affected}
+        self.categorizer = new_categorizer
+
+        # Unaffected descriptions keep their result, re-pointed at the new
+        # indexes; cached results for descriptions no longer in the ledger are dropped
+        positions = {rule: index for index, rule in reversed(list(enumerate(new_rules)))}
+        self.results = {
+            description: None if self.results[description] is None else positions[old_rules[self.results[description]]]
+            for description in self.groups
+            if description not in affected and self.results.get(description, -1) != -1
+        }
+
+        # Build the category cache aside and swap it in whole, since the
+        # chart renderer reads it from its own thread
+        categories = {
+            description: new_rules[index].category
+            for description, index in self.results.items() if index is not None
+        }
+        self.categories = categories
+
+        changed = 0
+        for description in affected:
+            old_index = old_results[description]
+            new_index = self._classify(description)
+            old_category = None if old_index is None else old_rules[old_index].category
+            if categories.get(description) == old_category:
+                continue
+
+            # Transactions with their own category are not affected by rules
+            changed += sum(1 for transaction in self.groups[description] if not transaction.get("category"))
+        return changed
@@ -0,0 +1,143 @@
+from collections import defaultdict
+from src.utils.money import cents_to_dollars
+
+# Colours used when rendering outside the themed window, e.g. for reports
+REPORT_COLORS = {
+    'background': "#FFFFFF",
+    'text': "#111827",
+    'grid': "#E5E7EB",
+    'income': "#10B981",
+    'expense': "#EF4444",
+    'balance': "#4F46E5",
+}
+
+# Number of slices shown in the expense breakdown before grouping into "Other"
+MAX_SLICES = 6
+
+
+def summarize(transactions, category_of=None, amount_of=None):
+    """
+    Aggregate transactions for the summary charts
+
+    Args:
+        transactions (iterable): Transactions with amounts in cents
+        category_of (callable): Lookup of a transaction's category, e.g. one
+            that also applies categorization rules
+        amount_of (callable): Converts a transaction's amount into the
+            reporting currency, returning None to leave it out; without it
+            amounts are used as they are
+
+    Returns:
+        dict: Totals, expense breakdown and daily running balance in cents
+    """
+    if category_of is None:
+        category_of = lambda transaction: transaction.get("category")
+
+    total_income = 0
+    total_expenses = 0
+    breakdown = defaultdict(int)
+    daily = defaultdict(int)
+
+    for transaction in transactions:
+        amount = transaction["amount"] if amount_of is None else amount_of(transaction)
+        if amount is None:
+            continue
+        if transaction["type"] == "Income":
+            total_income += amount
+            daily[transaction["date"]] += amount
+        else:
+            total_expenses += amount
+            daily[transaction["date"]] -= amount
+            breakdown[category_of(transaction) or transaction["description"]] += amount
+
+    # Largest expense groups first, the rest folded into "Other"
+    slices = sorted(breakdown.items(), key=lambda item: item[1], reverse=True)
+    if len(slices) > MAX_SLICES:
+        other = sum(amount for _, amount in slices[MAX_SLICES - 1:])
+        slices = slices[:MAX_SLICES - 1] + [("Other", other)]
+
+    balance = []
+    running = 0
+    for date in sorted(daily):
+        running += daily[date]
+        balance.append((date, running))
+
+    return {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "slices": slices,
+        "balance": balance,
+    }
+
+
+def draw_summary(figure, transactions, colors=REPORT_COLORS, title=None, summary=None, currency=None):
+    """
+    Draw the income/expense summary charts onto a matplotlib figure
+
+    Works with any backend; only the figure API is used, never pyplot.
+
+    Args:
+        figure (matplotlib.figure.Figure): Figure to draw on, cleared first
+        transactions (iterable): Transactions with amounts in cents
+        colors (dict): Colour palette, see REPORT_COLORS
+        title (str): Optional title above the charts
+        summary (dict): Result of summarize() if already computed; the
+            transactions are then not read
+        currency (str): Currency code the amounts are in, shown in the titles
+
+    Returns:
+        dict: The aggregated summary that was drawn
+    """
+    if summary is None:
+        summary = summarize(transactions)
+
+    figure.clear()
+    figure.set_facecolor(colors['background'])
+    if title:
+        figure.suptitle(title, color=colors['text'], fontsize=14, fontweight="bold")
+
+    grid = figure.add_gridspec(2, 2)
+    totals_ax = figure.add_subplot(grid[0, 0])
+    breakdown_ax = figure.add_subplot(grid[0, 1])
+    balance_ax = figure.add_subplot(grid[1, :])
+
+    for ax in (totals_ax, breakdown_ax, balance_ax):
+        ax.set_facecolor(colors['background'])
+        ax.tick_params(colors=colors['text'])
+        for spine in ax.spines.values():
+            spine.set_color(colors['grid'])
+
+    # Income vs expenses
+    totals_ax.bar(
+        ["Income", "Expenses"],
+        [cents_to_dollars(summary["total_income"]), cents_to_dollars(summary["total_expenses"])],
+        color=[colors['income'], colors['expense']]
+    )
+    unit = f" ({currency})" if currency else ""
+    totals_ax.set_title(f"Income vs Expenses{unit}", color=colors['text'])
+
+    # Expense breakdown
+    breakdown_ax.set_title(f"Expense Breakdown{unit}", color=colors['text'])
+    if summary["slices"]:
+        labels, amounts = zip(*summary["slices"])
+        breakdown_ax.pie(
+            [cents_to_dollars(amount) for amount in amounts],
+            labels=labels,
+            textprops={'color': colors['text'], 'fontsize': 8}
+        )
+    else:
+        breakdown_ax.text(0.5, 0.5, "No expenses", ha="center", va="center", color=colors['text'])
+        breakdown_ax.axis("off")
+
+    # Running balance
+    balance_ax.set_title(f"Net Balance{unit}", color=colors['text'])
+    if summary["balance"]:
+        dates, balances = zip(*summary["balance"])
+        balance_ax.plot(range(len(dates)), [cents_to_dollars(value) for value in balances], color=colors['balance'])
+        step = max(1, len(dates) // 8)
+        balance_ax.set_xticks(range(0, len(dates), step))
+        balance_ax.set_xticklabels(dates[::step], rotation=30, ha="right", fontsize=8)
+    balance_ax.grid(True, color=colors['grid'])
+
+    figure.tight_layout(rect=(0, 0, 1, 0.94) if title else (0, 0, 1, 1))
+    return summary
@@ -0,0 +1,172 @@
+import threading
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from src.utils.chart_figures import REPORT_COLORS, summarize, draw_summary
+
+
+class RenderCancelled(Exception):
+    """Raised inside the worker when newer data makes a render pointless"""
+
+
+class ChartRenderer:
+    """Renders the summary charts with Agg on a background thread
+
+    Only the newest request is kept: submitting new data replaces any
+    request that has not started and cancels the one in flight at its next
+    stage. Finished frames are copied into one of two reusable RGBA buffers,
+    so the worker can draw the next frame while the UI thread reads the
+    last one, and a frame overtaken by newer data is dropped, never queued.
+
+    A render that fails is reported through take_error() and the worker
+    carries on with the next request; a worker that has died anyway is
+    started again by the next submit().
+    """
+
+    def __init__(self, colors=REPORT_COLORS, dpi=100, category_of=None, convert=None):
+        self.colors = colors
+        self.dpi = dpi
+        # Called on the worker thread, so they must only read shared state;
+        # convert(transaction, currency) works like RateTable.convert_amount
+        self.category_of = category_of
+        self.convert = convert
+
+        # The figure and canvas are only ever touched by the worker thread
+        self.figure = Figure(dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.pending = None
+        self.rendering = False
+        self.error = None
+
+        # Held while drawing, so a replaced worker never shares the figure
+        self.render_lock = threading.Lock()
+
+        # Double-buffered RGBA frames; frame is (generation, buffer index, width, height)
+        self.buffers = [bytearray(), bytearray()]
+        self.last_index = 0
+        self.frame = None
+
+        self.thread = None
+
+    def submit(self, transactions, width, height, currency=None):
+        """
+        Ask for the charts to be drawn for new data or a new size
+
+        Args:
+            transactions (list): A snapshot the UI thread will not modify
+            width (int): Image width in pixels
+            height (int): Image height in pixels
+            currency (str): Currency to convert amounts into, if convert is set
+        """
+        with self.condition:
+            self.generation += 1
+            self.pending = (self.generation, transactions, width, height, currency)
+            self.condition.notify_all()
+
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="chart-renderer", daemon=True)
+                self.thread.start()
+
+    def busy(self):
+        """Whether a frame or an error is being produced or waiting to be shown"""
+        with self.condition:
+            return (self.pending is not None or self.rendering or self.frame is not None
+                    or self.error is not None)
+
+    def take_error(self):
+        """
+        Get the error of the last failed render, once
+
+        Returns:
+            Exception: The error, or None if no render failed since the last call
+        """
+        with self.condition:
+            error, self.error = self.error, None
+            return error
+
+    def take_frame(self, show):
+        """
+        Hand the newest finished frame to a callback on the calling thread
+
+        The buffer is only valid during the call; show must copy it, e.g.
+        into a Tk image.
+
+        Args:
+            show (callable): Called as show(buffer, width, height)
+
+        Returns:
+            bool: True if a frame was shown
+        """
+        with self.condition:
+            frame, self.frame = self.frame, None
+            if frame is None or frame[0] != self.generation:
+                return False
+            _, index, width, height = frame
+            show(self.buffers[index], width, height)
+            return True
+
+    def stop(self):
+        """Stop the worker thread; a later submit() starts a new one"""
+        with self.condition:
+            self.thread = None
+            self.pending = None
+            self.generation += 1
+            self.condition.notify_all()
+
+    def _run(self):
+        current = threading.current_thread()
+        while True:
+            with self.condition:
+                # A worker exits once stop() or a restart has replaced it
+                while self.pending is None and self.thread is current:
+                    self.condition.wait()
+                if self.thread is not current:
+                    return
+                job, self.pending = self.pending, None
+                self.rendering = True
+
+            try:
+                with self.render_lock:
+                    self._render(*job)
+            except RenderCancelled:
+                pass
+            except Exception as e:
+                # Keep serving requests; the UI shows the error instead of a frame
+                with self.condition:
+                    if job[0] == self.generation:
+                        self.error = e
+            finally:
+                with self.condition:
+                    self.rendering = False
+
+    def _check(self, generation):
+        if generation != self.generation:
+            raise RenderCancelled()
+
+    def _render(self, generation, transactions, width, height, currency):
+        amount_of = None
+        if self.convert is not None and currency is not None:
+            amount_of = lambda transaction: self.convert(transaction, currency)
+        summary = summarize(transactions, self.category_of, amount_of)
+        self._check(generation)
+
+        self.figure.set_size_inches(width / self.dpi, height / self.dpi)
+        draw_summary(self.figure, (), self.colors, summary=summary, currency=currency)
+        self._check(generation)
+
+        self.canvas.draw()
+        self._check(generation)
+
+        # Copy into the buffer the UI thread is not reading; reallocate only on resize
+        width, height = self.canvas.get_width_height()
+        index = 1 - self.last_index
+        if len(self.buffers[index]) != width * height * 4:
+            self.buffers[index] = bytearray(width * height * 4)
+        self.buffers[index][:] = self.canvas.buffer_rgba()
+
+        with self.condition:
+            if generation == self.generation:
+                self.frame = (generation, index, width, height)
+                self.last_index = index
@@ -0,0 +1,218 @@
+import os
+from src.utils.money import parse_cents
+from src.utils.currency import normalize_currency
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+ARROW_EXTENSIONS = (".arrow", ".feather")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# Column order of exported files
+COLUMNS = ("date", "description", "type", "amount", "category", "currency")
+
+# Rows converted to Python objects at a time when reading a file back
+READ_BATCH_ROWS = 64 * 1024
+
+
+def require_pyarrow():
+    """Raise a readable error when the optional pyarrow package is missing"""
+    if pa is None:
+        raise ImportError("Arrow and Parquet files need the pyarrow package (pip install pyarrow).")
+
+
+def ledger_schema():
+    """
+    Get the typed schema of exported ledgers
+
+    Dates are date32, amounts int64 cents, and the repetitive text columns
+    are dictionary encoded so each distinct value is stored once.
+    """
+    require_pyarrow()
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            pa.field("date", pa.date32(), nullable=False),
+            pa.field("description", text, nullable=False),
+            pa.field("type", text, nullable=False),
+            pa.field("amount", pa.int64(), nullable=False),
+            pa.field("category", text),
+            pa.field("currency", text),
+        ],
+        metadata={"amount_unit": "cents"}
+    )
+
+
+def to_table(transactions):
+    """
+    Build a typed Arrow table from transactions
+
+    Args:
+        transactions (iterable): Transactions with amounts in cents
+
+    Returns:
+        pyarrow.Table: One typed column per field
+    """
+    require_pyarrow()
+    dates, descriptions, types, amounts, categories, currencies = [], [], [], [], [], []
+    for transaction in transactions:
+        dates.append(transaction["date"])
+        descriptions.append(transaction["description"])
+        types.append(transaction["type"])
+        amounts.append(transaction["amount"])
+        categories.append(transaction.get("category") or None)
+        currencies.append(transaction.get("currency") or None)
+
+    schema = ledger_schema()
+    columns = [
+        pa.array(dates, pa.string()).cast(pa.date32()),
+        pa.array(descriptions, pa.string()).dictionary_encode(),
+        pa.array(types, pa.string()).dictionary_encode(),
+        pa.array(amounts, pa.int64()),
+        pa.array(categories, pa.string()).dictionary_encode(),
+        pa.array(currencies, pa.string()).dictionary_encode(),
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_table(transactions, file_path):
+    """
+    Write transactions as an Arrow IPC (Feather) or Parquet file
+
+    Arrow files are written uncompressed so they can be memory-mapped
+    without copying; Parquet files are compressed for size.
+
+    Args:
+        transactions (iterable): Transactions with amounts in cents
+        file_path (str): Destination; the extension selects the format
+    """
+    table = to_table(transactions)
+    extension = os.path.splitext(file_path)[1].lower()
+
+    # Write to a temporary file first so a crash never leaves half a file
+    temp_path = file_path + ".tmp"
+    if extension in PARQUET_EXTENSIONS:
+        pq.write_table(table, temp_path, compression="zstd")
+    else:
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(temp_path, file_path)
+
+
+def read_table(file_path):
+    """
+    Read an Arrow IPC (Feather) or Parquet file as a table
+
+    Arrow files are memory-mapped, so their columns reference the file's
+    pages directly instead of being copied into memory.
+
+    Args:
+        file_path (str): Path of the file; the extension selects the format
+
+    Returns:
+        pyarrow.Table: The table as stored
+    """
+    require_pyarrow()
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return pq.read_table(file_path, memory_map=True)
+
+    source = pa.memory_map(file_path, "r")
+    try:
+        return pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        # Arrow streams have no footer and are read front to back
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+
+def _text_column(column):
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    return column.cast(pa.string())
+
+
+def _decode_repeated(column, convert):
+    """
+    Convert a column with few distinct values to a list of Python strings
+
+    Only the distinct values are converted; rows share the resulting
+    objects, which is both faster and lighter than decoding row by row.
+    """
+    if not pa.types.is_dictionary(column.type):
+        column = column.dictionary_encode()
+    values = convert(column.dictionary).to_pylist()
+    return [None if index is None else values[index] for index in column.indices.to_pylist()]
+
+
+def _date_values(column):
+    if pa.types.is_timestamp(column.type) or pa.types.is_date64(column.type):
+        column = column.cast(pa.date32())
+    if pa.types.is_date32(column.type):
+        return pc.strftime(column, format="%Y-%m-%d")
+    return _text_column(column)
+
+
+def _amount_column(column, in_cents):
+    if pa.types.is_integer(column.type):
+        amounts = column.cast(pa.int64())
+        if not in_cents:
+            # Integer amounts from other tools are whole dollars
+            amounts = pc.multiply(amounts, 100)
+        return amounts.to_pylist()
+    if pa.types.is_floating(column.type):
+        # Float dollars, e.g. 0.1 + 0.2 from pandas; parse_cents rounds floats to the cent
+        return [parse_cents(value) for value in column.to_pylist()]
+    # Files written by other tools may also hold text or decimal dollars
+    return [parse_cents(value) for value in _text_column(column).to_pylist()]
+
+
+def iter_transactions(table):
+    """
+    Convert a table back into transactions, one record batch at a time
+
+    Args:
+        table (pyarrow.Table): A table written by write_table or any table
+            with date, description, type and amount columns
+
+    Yields:
+        dict: Transactions with amounts in cents
+    """
+    missing = [name for name in COLUMNS[:4] if name not in table.column_names]
+    if missing:
+        raise ValueError(f"The file has no {', '.join(missing)} column.")
+
+    in_cents = (table.schema.metadata or {}).get(b"amount_unit") == b"cents"
+    for batch in table.to_batches(max_chunksize=READ_BATCH_ROWS):
+        for name in COLUMNS[:4]:
+            if batch.column(name).null_count:
+                raise ValueError(f"The file has empty {name} values.")
+
+        rows = [
+            {"date": date, "description": description, "amount": amount, "type": transaction_type}
+            for date, description, transaction_type, amount in zip(
+                _decode_repeated(batch.column("date"), _date_values),
+                _decode_repeated(batch.column("description"), _text_column),
+                _decode_repeated(batch.column("type"), _text_column),
+                _amount_column(batch.column("amount"), in_cents))
+        ]
+
+        # Optional fields are set only on the rows that have them
+        for name in COLUMNS[4:]:
+            if name not in batch.schema.names or batch.column(name).null_count == batch.num_rows:
+                continue
+            values = _decode_repeated(batch.column(name), _text_column)
+            if name == "currency":
+                # Files from other tools may hold codes like "eur"; each distinct code is checked once
+                codes = {value: normalize_currency(value) for value in set(values) if value}
+                values = [codes.get(value) for value in values]
+            for row, value in zip(rows, values):
+                if value:
+                    row[name] = value
+
+        yield from rows
@@ -0,0 +1,359 @@
+import csv
+import os
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import numpy as np
+from src.utils.money import format_cents
+
+# Amounts without a currency field are in the base currency, which is also
+# the unit rate tables are quoted in
+DEFAULT_CURRENCY = "USD"
+
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "INR": "₹",
+}
+
+# Folder of rate tables read at startup, relative to the working directory
+RATES_DIR = "rates"
+
+ONE = Decimal(1)
+
+
+class CurrencyError(ValueError):
+    """Raised when a rate table is malformed"""
+
+
+def currency_of(transaction):
+    """Get the currency code of a transaction"""
+    return transaction.get("currency") or DEFAULT_CURRENCY
+
+
+def normalize_currency(code):
+    """
+    Validate a currency code such as "eur"
+
+    Returns:
+        str: The upper-case three-letter code
+
+    Raises:
+        ValueError: If the code is not three letters
+    """
+    code = str(code).strip().upper()
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f"Invalid currency code: {code!r}")
+    return code
+
+
+def format_money(cents, currency=DEFAULT_CURRENCY, signed=False):
+    """Format cents in a currency, e.g. "€12.50", or "CHF 12.50" without a known symbol"""
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+    return format_cents(cents, signed=signed, symbol=symbol)
+
+
+def convert(cents, factor):
+    """Apply a conversion factor to an amount in cents, rounding half up"""
+    if factor == ONE:
+        return cents
+    return int((cents * factor).to_integral_value(ROUND_HALF_UP))
+
+
+def convert_amounts(cents, factors):
+    """
+    Apply conversion factors to arrays of cents at once, rounding half up
+
+    Factors are applied as float64, which stays well below a cent of error
+    for any amount a ledger holds; scalars work too.
+
+    Returns:
+        numpy.ndarray: Converted cents as int64
+    """
+    products = np.asarray(cents, np.float64) * np.asarray(factors, np.float64)
+    return np.floor(products + 0.5).astype(np.int64)
+
+
+def convert_transactions(transactions, rates, reporting):
+    """
+    Copy transactions with their amounts converted into a reporting currency
+
+    Args:
+        transactions (iterable): Transactions in any currencies
+        rates (RateTable): Rates used for the conversion
+        reporting (str): Currency code to convert into
+
+    Returns:
+        tuple: (converted transactions, currencies without rates); transactions
+        in a currency without rates are left out
+    """
+    converted = []
+    missing = set()
+    for transaction in transactions:
+        amount = rates.convert_amount(transaction, reporting)
+        if amount is None:
+            missing.add(currency_of(transaction))
+        elif currency_of(transaction) == reporting:
+            converted.append(transaction)
+        else:
+            converted.append(dict(transaction, amount=amount, currency=reporting))
+    return converted, sorted(missing)
+
+
+def daily_totals(transactions):
+    """
+    Sum income and expenses per date and currency
+
+    Returns:
+        list: [date, currency, income, expenses] rows in cents
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for transaction in transactions:
+        bucket = totals[(transaction["date"], currency_of(transaction))]
+        if transaction["type"] == "Income":
+            bucket[0] += transaction["amount"]
+        else:
+            bucket[1] += transaction["amount"]
+    return [[date, currency, income, expenses] for (date, currency), (income, expenses) in sorted(totals.items())]
+
+
+class RateTable:
+    """Daily exchange rates, each the value of one unit in DEFAULT_CURRENCY
+
+    A date without a quote uses the latest earlier one (or the earliest
+    quote for dates before the table starts). Lookups are cached per
+    currency and date, and the cache of a currency is dropped when new
+    rates for it are read.
+
+    The chart renderer reads rates from its own thread, so each currency's
+    sorted dates, values and cache are replaced together as one tuple and
+    a lookup never mixes old and new rates.
+    """
+
+    def __init__(self):
+        # currency -> {date: rate}
+        self.quotes = {}
+        # currency -> (sorted dates, rates in the same order, {date: rate} cache)
+        self.series = {}
+
+    @classmethod
+    def load_directory(cls, directory=RATES_DIR):
+        """
+        Read every CSV rate table in a folder
+
+        Args:
+            directory (str): Folder to read; a missing folder gives an empty table
+
+        Returns:
+            RateTable: The loaded rates
+        """
+        table = cls()
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.lower().endswith(".csv"):
+                    table.read_file(os.path.join(directory, name))
+        return table
+
+    def read_file(self, file_path):
+        """
+        Merge rates from a CSV file into the table
+
+        The file has date and rate columns and either a currency column or a
+        name such as EUR.csv. Rates are the value of one unit in USD.
+
+        Args:
+            file_path (str): Path of the CSV file
+
+        Returns:
+            set: Currencies whose rates changed
+
+        Raises:
+            CurrencyError: If a row is invalid
+        """
+        stem_currency = os.path.splitext(os.path.basename(file_path))[0]
+        updates = defaultdict(dict)
+
+        with open(file_path, 'r', newline='') as file:
+            reader = csv.DictReader(file)
+            for line_number, row in enumerate(reader, 2):
+                try:
+                    currency = normalize_currency(row.get("currency") or stem_currency)
+                    date = row["date"].strip()
+                    rate = Decimal(row["rate"].strip())
+                except (KeyError, AttributeError, InvalidOperation, ValueError) as e:
+                    raise CurrencyError(f"{os.path.basename(file_path)} line {line_number}: {e or 'invalid row'}") from None
+                if len(date) != 10 or not rate.is_finite() or rate <= 0:
+                    raise CurrencyError(f"{os.path.basename(file_path)} line {line_number}: invalid date or rate")
+                updates[currency][date] = rate
+
+        changed = set()
+        for currency, quotes in updates.items():
+            current = self.quotes.setdefault(currency, {})
+            if any(current.get(date) != rate for date, rate in quotes.items()):
+                current.update(quotes)
+                dates = sorted(current)
+                self.series[currency] = (dates, [current[date] for date in dates], {})
+                changed.add(currency)
+        return changed
+
+    def currencies(self):
+        """Get the currencies that can be converted, including the base currency"""
+        return sorted(set(self.quotes) | {DEFAULT_CURRENCY})
+
+    def rate(self, currency, date):
+        """
+        Get the value of one unit of a currency in DEFAULT_CURRENCY on a date
+
+        Returns:
+            Decimal: The rate, or None if the currency has no rates
+        """
+        if currency == DEFAULT_CURRENCY:
+            return ONE
+
+        series = self.series.get(currency)
+        if series is None:
+            return None
+        dates, values, cache = series
+        rate = cache.get(date)
+        if rate is None:
+            rate = values[max(bisect_right(dates, date) - 1, 0)]
+            cache[date] = rate
+        return rate
+
+    def factor(self, from_currency, to_currency, date):
+        """
+        Get the multiplier converting one currency into another on a date
+
+        Returns:
+            Decimal: The factor, or None if either currency has no rates
+        """
+        if from_currency == to_currency:
+            return ONE
+        source = self.rate(from_currency, date)
+        target = self.rate(to_currency, date)
+        if source is None or target is None:
+            return None
+        return source / target
+
+    def convert_amount(self, transaction, reporting):
+        """
+        Get the amount of a transaction in a reporting currency on its date
+
+        Returns:
+            int: Cents in the reporting currency, or None if there are no rates
+        """
+        factor = self.factor(currency_of(transaction), reporting, transaction["date"])
+        if factor is None:
+            return None
+        return convert(transaction["amount"], factor)
+
+
+class CurrencyTotals:
+    """Income and expense totals converted into any reporting currency
+
+    Amounts are kept summed per currency and date, so converting the whole
+    ledger touches one bucket per day rather than every transaction; the
+    buckets of a currency are converted as one numpy array, and each
+    currency's converted sum is memoized per reporting currency. Adding
+    transactions adjusts the memoized sums of their buckets only, and new
+    rates only recompute the sums of the currencies they change.
+    """
+
+    def __init__(self, rates):
+        self.rates = rates
+        # currency -> {date: [income, expenses]}
+        self.buckets = {}
+        # reporting currency -> {currency: [income, expenses] or None if unconvertible}
+        self.memo = {}
+
+    def rebuild(self, transactions, daily=()):
+        """
+        Re-sum a whole ledger
+
+        Args:
+            transactions (iterable): The transactions in memory
+            daily (iterable): Extra [date, currency, income, expenses] rows,
+                e.g. for archived months that are not loaded
+        """
+        self.buckets = {}
+        self.memo = {}
+        for date, currency, income, expenses in daily:
+            bucket = self.buckets.setdefault(currency, {}).setdefault(date, [0, 0])
+            bucket[0] += income
+            bucket[1] += expenses
+        for transaction in transactions:
+            bucket = self.buckets.setdefault(currency_of(transaction), {}).setdefault(transaction["date"], [0, 0])
+            bucket[transaction["type"] != "Income"] += transaction["amount"]
+
+    def add(self, transactions):
+        """Add new transactions, adjusting memoized totals in place"""
+        for transaction in transactions:
+            currency = currency_of(transaction)
+            date = transaction["date"]
+            side = transaction["type"] != "Income"
+            bucket = self.buckets.setdefault(currency, {}).setdefault(date, [0, 0])
+            before = bucket[side]
+            bucket[side] += transaction["amount"]
+
+            for reporting, sums in self.memo.items():
+                converted = sums.get(currency)
+                if converted is None:
+                    continue
+                factor = self.rates.factor(currency, reporting, date)
+                if factor is None:
+                    sums[currency] = None
+                else:
+                    converted[side] += int(convert_amounts(bucket[side], factor) - convert_amounts(before, factor))
+
+    def rates_changed(self, currencies):
+        """Recompute memoized sums affected by new rates for some currencies"""
+        for reporting in list(self.memo):
+            if reporting in currencies:
+                # Every factor into this currency changed
+                del self.memo[reporting]
+                continue
+            for currency in currencies:
+                self.memo[reporting].pop(currency, None)
+
+    def totals(self, reporting):
+        """
+        Get all-time totals converted into a reporting currency
+
+        Args:
+            reporting (str): Currency code to report in
+
+        Returns:
+            tuple: (income, expenses, currencies without rates), amounts in cents
+        """
+        sums = self.memo.setdefault(reporting, {})
+        income = expenses = 0
+        missing = []
+        for currency in self.buckets:
+            if currency not in sums:
+                sums[currency] = self._convert_currency(currency, reporting)
+            converted = sums[currency]
+            if converted is None:
+                missing.append(currency)
+                continue
+            income += converted[0]
+            expenses += converted[1]
+        return income, expenses, sorted(missing)
+
+    def _convert_currency(self, currency, reporting):
+        buckets = self.buckets[currency]
+        if currency == reporting:
+            return [sum(day[0] for day in buckets.values()), sum(day[1] for day in buckets.values())]
+
+        factor = self.rates.factor
+        factors = []
+        for date in buckets:
+            day_factor = factor(currency, reporting, date)
+            if day_factor is None:
+                return None
+            factors.append(day_factor)
+
+        # One row of [income, expenses] per day, each scaled by its day's factor
+        amounts = np.array(list(buckets.values()), np.int64).reshape(-1, 2)
+        income, expenses = convert_amounts(amounts, np.array(factors, np.float64)[:, None]).sum(axis=0)
+        return [int(income), int(expenses)]
@@ -1,7 +1,13 @@
 import json
 import os
+import shutil
 from tkinter import filedialog, messagebox
 import pickle
+from src.utils.money import parse_cents, cents_to_str
+from src.utils.partitioned_store import PartitionedStore, MANIFEST_NAME
+from src.utils.statement_parsers import iter_statement
+from src.utils.columnar import write_table, read_table, iter_transactions, require_pyarrow
+from src.utils.currency import RATES_DIR, normalize_currency
 
 class FileHandler:
     """Utility class for handling file operations (save/load)"""
@@ -58,11 +64,7 @@ class FileHandler:
             if not file_path:
                 return None
             
-            # Load data from the selected file
-            with open(file_path, 'r') as file:
-                data = json.load(file)
-            
-            return data
+            return FileHandler.read_data(file_path)
         
         except json.JSONDecodeError:
             messagebox.showerror("Load Error", "The selected file is not a valid JSON file.")
@@ -72,13 +74,54 @@ class FileHandler:
             messagebox.showerror("Load Error", f"An error occurred while loading: {str(e)}")
             return None
     
+    @staticmethod
+    def read_data(file_path):
+        """
+        Read financial data from a JSON file without any dialogs
+        
+        Args:
+            file_path (str): Path of the JSON file
+        
+        Returns:
+            dict: The loaded financial data with amounts in cents
+        """
+        with open(file_path, 'r') as file:
+            data = json.load(file)
+        
+        return FileHandler.normalize_amounts(data)
+    
+    @staticmethod
+    def normalize_amounts(data):
+        """
+        Convert amounts in loaded data to integer cents
+        
+        Files saved before amounts were stored in cents hold float dollars
+        and have no "amount_unit" marker.
+        
+        Args:
+            data (dict): The loaded financial data
+        
+        Returns:
+            dict: The same data with all amounts and totals in cents
+        """
+        if data.get("amount_unit") == "cents":
+            return data
+        
+        for transaction in data.get("transactions", []):
+            transaction["amount"] = parse_cents(transaction["amount"])
+        for key in ("total_income", "total_expenses"):
+            if key in data:
+                data[key] = parse_cents(data[key])
+        data["amount_unit"] = "cents"
+        return data
+    
     @staticmethod
     def export_to_csv(data, default_filename="finance_data.csv"):
         """
         Export financial data to a CSV file
         
         Args:
-            data (list): List of transaction dictionaries
+            data (list): List of transaction dictionaries (amounts in cents)
             default_filename (str): Default filename to suggest
         
         Returns:
@@ -99,14 +142,15 @@ class FileHandler:
                 return False
             
             # Define CSV headers based on transaction data structure
-            headers = ["date", "description", "amount", "type"]
+            headers = ["date", "description", "amount", "type", "category", "currency"]
             
             # Write data to CSV file
             with open(file_path, 'w', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=headers)
+                writer = csv.DictWriter(file, fieldnames=headers, extrasaction='ignore')
                 writer.writeheader()
                 for transaction in data:
-                    writer.writerow(transaction)
+                    # CSV amounts stay in dollars for other tools
+                    writer.writerow(dict(transaction, amount=cents_to_str(transaction["amount"])))
             
             return True
             
@@ -140,12 +184,232 @@ class FileHandler:
             with open(file_path, 'r', newline='') as file:
                 reader = csv.DictReader(file)
                 for row in reader:
-                    # Convert amount to float
-                    row['amount'] = float(row['amount'])
+                    # Parse dollar amount exactly into cents; older exports wrote
+                    # float dollars such as 12.345, rounded like legacy JSON files
+                    row['amount'] = parse_cents(row['amount'], round_sub_cents=True)
+                    if not row.get('category'):
+                        row.pop('category', None)
+                    if row.get('currency'):
+                        row['currency'] = normalize_currency(row['currency'])
+                    else:
+                        row.pop('currency', None)
                     transactions.append(row)
             
             return transactions
             
         except Exception as e:
             messagebox.showerror("Import Error", f"An error occurred while importing: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    def export_to_columnar(data, default_filename="finance_data.arrow"):
+        """
+        Export financial data to an Arrow (Feather) or Parquet file
+        
+        Args:
+            data (list): List of transaction dictionaries (amounts in cents)
+            default_filename (str): Default filename to suggest
+        
+        Returns:
+            bool: True if export was successful, False otherwise
+        """
+        try:
+            require_pyarrow()
+            
+            # Ask user where to save the file; the extension picks the format
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".arrow",
+                filetypes=[
+                    ("Arrow files", "*.arrow *.feather"),
+                    ("Parquet files", "*.parquet"),
+                    ("All files", "*.*")
+                ],
+                initialfile=default_filename
+            )
+            
+            # If user cancels the save dialog
+            if not file_path:
+                return False
+            
+            write_table(data, file_path)
+            return True
+        
+        except Exception as e:
+            messagebox.showerror("Export Error", f"An error occurred while exporting: {str(e)}")
+            return False
+    
+    @staticmethod
+    def import_from_columnar():
+        """
+        Import financial data from an Arrow (Feather) or Parquet file
+        
+        Arrow files are memory-mapped; rows are converted to transactions
+        batch by batch as the returned generator is consumed.
+        
+        Returns:
+            generator: Transactions with amounts in cents, or None if import failed
+        """
+        try:
+            require_pyarrow()
+            
+            # Ask user which file to import
+            file_path = filedialog.askopenfilename(
+                filetypes=[
+                    ("Columnar files", "*.arrow *.feather *.parquet"),
+                    ("Arrow files", "*.arrow *.feather"),
+                    ("Parquet files", "*.parquet"),
+                    ("All files", "*.*")
+                ]
+            )
+            
+            # If user cancels the open dialog
+            if not file_path:
+                return None
+            
+            return iter_transactions(read_table(file_path))
+        
+        except Exception as e:
+            messagebox.showerror("Import Error", f"An error occurred while importing: {str(e)}")
+            return None
+    
+    @staticmethod
+    def import_rate_table(rates):
+        """
+        Read a CSV table of daily exchange rates and keep a copy for later sessions
+        
+        Args:
+            rates (RateTable): The table to merge the rates into
+        
+        Returns:
+            set: Currencies whose rates changed, or None if import failed
+        """
+        try:
+            # Ask user which rate table to import
+            file_path = filedialog.askopenfilename(
+                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            )
+            
+            # If user cancels the open dialog
+            if not file_path:
+                return None
+            
+            changed = rates.read_file(file_path)
+            
+            # Rate tables in the rates folder are read at every start
+            os.makedirs(RATES_DIR, exist_ok=True)
+            destination = os.path.join(RATES_DIR, os.path.basename(file_path))
+            if os.path.abspath(destination) != os.path.abspath(file_path):
+                shutil.copyfile(file_path, destination)
+            
+            return changed
+        
+        except Exception as e:
+            messagebox.showerror("Import Error", f"An error occurred while importing: {str(e)}")
+            return None
+    
+    @staticmethod
+    def import_statement():
+        """
+        Choose an OFX, QFX or QIF bank statement to import
+        
+        The statement is not read here; the returned generator parses it
+        incrementally as it is consumed and raises StatementError (a
+        ValueError) if the file is malformed.
+        
+        Returns:
+            generator: Transactions with amounts in cents, or None if cancelled
+        """
+        # Ask user which statement to import
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Bank statements", "*.ofx *.qfx *.qif"),
+                ("OFX files", "*.ofx *.qfx"),
+                ("QIF files", "*.qif"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        # If user cancels the open dialog
+        if not file_path:
+            return None
+        
+        return iter_statement(file_path)
+    
+    @staticmethod
+    def open_partitioned():
+        """
+        Open a ledger folder saved as monthly partitions
+        
+        Only the manifest is read; partitions are read later as needed.
+        
+        Returns:
+            PartitionedStore: The opened store or None if opening failed
+        """
+        try:
+            # Ask user which folder to open
+            directory = filedialog.askdirectory(title="Open Ledger Folder")
+            
+            # If user cancels the dialog
+            if not directory:
+                return None
+            
+            return PartitionedStore.open(directory)
+        
+        except FileNotFoundError:
+            messagebox.showerror("Load Error", f"The selected folder does not contain a {MANIFEST_NAME} file.")
+            return None
+        
+        except Exception as e:
+            messagebox.showerror("Load Error", f"An error occurred while loading: {str(e)}")
+            return None
+    
+    @staticmethod
+    def ask_partitioned_folder():
+        """
+        Ask the user for a folder to save a ledger into
+        
+        Returns:
+            str: The chosen folder or None if cancelled
+        """
+        return filedialog.askdirectory(title="Save to Ledger Folder") or None
+    
+    @staticmethod
+    def save_partitioned(directory, transactions, **extra):
+        """
+        Save a complete ledger as monthly partitions
+        
+        Args:
+            directory (str): Folder to write into
+            transactions (list): All transactions of the ledger
+            **extra: Additional manifest fields, e.g. budgets
+        
+        Returns:
+            PartitionedStore: The written store or None if saving failed
+        """
+        try:
+            return PartitionedStore.create(directory, transactions, **extra)
+        
+        except Exception as e:
+            messagebox.showerror("Save Error", f"An error occurred while saving: {str(e)}")
+            return None
+    
+    @staticmethod
+    def update_partitions(store, groups, **extra):
+        """
+        Rewrite changed months of an open ledger folder
+        
+        Args:
+            store (PartitionedStore): The open store
+            groups (dict): Month to the complete list of its transactions
+            **extra: Manifest fields to update, e.g. budgets
+        
+        Returns:
+            bool: True if saving was successful, False otherwise
+        """
+        try:
+            store.write_partitions(groups, **extra)
+            return True
+        
+        except Exception as e:
+            messagebox.showerror("Save Error", f"An error occurred while saving: {str(e)}")
+            return False
@@ -0,0 +1,286 @@
+import asyncio
+import datetime
+import json
+import queue
+import threading
+from collections import deque
+from src.utils.money import parse_cents
+from src.utils.currency import normalize_currency
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Longest accepted line; protects the server from unbounded buffering
+MAX_LINE_BYTES = 64 * 1024
+
+
+def parse_transaction(record):
+    """
+    Validate an incoming transaction record
+
+    Args:
+        record (dict): Decoded JSON object with description, amount, type and
+            optionally date (YYYY-MM-DD, defaults to today), category and
+            currency (e.g. EUR)
+
+    Returns:
+        dict: A transaction with the amount in cents
+
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Expected a JSON object")
+
+    description = record.get("description")
+    if not isinstance(description, str) or not description.strip():
+        raise ValueError("Missing description")
+
+    transaction_type = str(record.get("type", "")).capitalize()
+    if transaction_type not in ("Income", "Expense"):
+        raise ValueError("Type must be Income or Expense")
+
+    if "amount" not in record:
+        raise ValueError("Missing amount")
+    amount = parse_cents(record["amount"])
+    if amount <= 0:
+        raise ValueError("Amount must be greater than zero")
+
+    date = record.get("date") or datetime.date.today().isoformat()
+    try:
+        datetime.datetime.strptime(date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError("Date must be YYYY-MM-DD") from None
+
+    transaction = {
+        "date": date,
+        "description": description.strip(),
+        "amount": amount,
+        "type": transaction_type
+    }
+    if isinstance(record.get("category"), str) and record["category"].strip():
+        transaction["category"] = record["category"].strip()
+    if record.get("currency"):
+        transaction["currency"] = normalize_currency(record["currency"])
+    return transaction
+
+
+class IngestServer:
+    """Local server accepting newline-delimited JSON transactions
+
+    Runs an asyncio event loop on a background thread. Each line is decoded
+    and validated there, valid transactions are grouped into batches, and the
+    batches are handed to the UI thread through a bounded queue that the UI
+    drains with drain(). When the UI falls behind the queue fills up, the
+    batcher stops pulling, and clients are slowed down by TCP flow control.
+
+    Clients get one JSON line back per rejected record and a summary line
+    when they close their side of the connection. Stopping the server keeps
+    every accepted record: they stay available to drain() afterwards.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None,
+                 batch_size=1000, batch_interval=0.05, max_pending=10000, max_batches=4):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_pending = max_pending
+
+        # Batches waiting for the UI thread, plus those handed off while
+        # stopping, when the UI thread is no longer draining the queue
+        self.batches = queue.Queue(maxsize=max_batches)
+        self.leftover = deque()
+
+        self.address = None
+        self._loop = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """
+        Start listening on a background thread
+
+        Returns:
+            The bound address: (host, port) for TCP or the socket path
+        """
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self._serve(ready))
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=run, name="ingest-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self.address
+
+    def stop(self):
+        """
+        Stop the server and wait for its thread to finish
+
+        Clients are disconnected, and records already accepted from them are
+        still batched, so a final drain() returns them.
+        """
+        self.request_stop()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        self._loop = None
+
+    def request_stop(self):
+        """
+        Begin stopping without waiting, e.g. from a UI thread
+
+        Keep calling drain() until is_running() is False; the drain after
+        that returns the last accepted records.
+        """
+        self._stopping.set()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(lambda: None)
+
+    def is_stopping(self):
+        return self._stopping.is_set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self):
+        """
+        Take every batch that is ready, without blocking
+
+        Returns:
+            list: Transactions from all ready batches, in arrival order
+        """
+        transactions = []
+        while True:
+            try:
+                transactions.extend(self.batches.get_nowait())
+            except queue.Empty:
+                break
+        while self.leftover:
+            transactions.extend(self.leftover.popleft())
+        return transactions
+
+    async def _serve(self, ready):
+        self._loop = asyncio.get_running_loop()
+        self._pending = asyncio.Queue(maxsize=self.max_pending)
+        self._writers = set()
+        self._clients = set()
+
+        if self.path:
+            server = await asyncio.start_unix_server(self._handle_client, path=self.path, limit=MAX_LINE_BYTES)
+            self.address = self.path
+        else:
+            server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_LINE_BYTES)
+            self.address = server.sockets[0].getsockname()[:2]
+
+        batcher = asyncio.create_task(self._batch_loop())
+        ready.set()
+
+        async with server:
+            while not self._stopping.is_set():
+                await asyncio.sleep(0.1)
+
+            # Stop accepting, let the clients finish, then flush what they sent
+            server.close()
+            for writer in list(self._writers):
+                writer.close()
+            if self._clients:
+                await asyncio.wait(list(self._clients), timeout=5)
+            await self._pending.put(None)
+            await batcher
+
+    async def _handle_client(self, reader, writer):
+        accepted = rejected = 0
+        line_number = 0
+        self._writers.add(writer)
+        self._clients.add(asyncio.current_task())
+        try:
+            while not self._stopping.is_set():
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than MAX_LINE_BYTES; the stream cannot recover
+                    writer.write(b'{"error": "Line too long"}\n')
+                    rejected += 1
+                    break
+                if not line:
+                    break
+
+                line_number += 1
+                if not line.strip():
+                    continue
+
+                # Any bad record, e.g. one too deeply nested to decode, only
+                # rejects its own line
+                try:
+                    transaction = parse_transaction(json.loads(line))
+                except Exception as e:
+                    rejected += 1
+                    writer.write(json.dumps({"line": line_number, "error": str(e)}).encode() + b"\n")
+                    await writer.drain()
+                    continue
+
+                # Waits here while the pipeline is full, which pauses reading
+                await self._pending.put(transaction)
+                accepted += 1
+
+            writer.write(json.dumps({"accepted": accepted, "rejected": rejected}).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._clients.discard(asyncio.current_task())
+            writer.close()
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            # None is queued once the clients are gone and the server stops
+            transaction = await self._pending.get()
+            if transaction is None:
+                return
+            batch = [transaction]
+
+            # Collect until the batch is full or the interval has passed
+            deadline = loop.time() + self.batch_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    transaction = await asyncio.wait_for(self._pending.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if transaction is None:
+                    finished = True
+                    break
+                batch.append(transaction)
+
+            await loop.run_in_executor(None, self._hand_off, batch)
+
+    def _hand_off(self, batch):
+        # Blocks while the UI has max_batches batches it has not drained yet
+        while not self._stopping.is_set():
+            try:
+                self.batches.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+        # The UI stops draining while the server stops; keep the batch for a final drain()
+        try:
+            self.batches.put_nowait(batch)
+        except queue.Full:
+            self.leftover.append(batch)
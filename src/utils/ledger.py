@@ -0,0 +1,304 @@
+from collections import namedtuple
+from src.utils.money import totals_cents
+
+# Branching factor of the persistent vector trie
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class PersistentVector:
+    """Immutable, structurally shared vector of transactions
+
+    Elements live in a 32-way trie of tuples plus a small tail tuple. Appending
+    copies only the tail or the path from the root to the new leaf, so every
+    older vector stays valid and shares almost all of its storage with newer
+    ones. Taking a snapshot is just keeping a reference.
+    """
+
+    __slots__ = ("_count", "_shift", "_root", "_tail")
+
+    def __init__(self, count=0, shift=BITS, root=(), tail=()):
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+
+    @classmethod
+    def from_iterable(cls, items):
+        """
+        Build a vector from an iterable in linear time
+
+        Args:
+            items (iterable): Elements to store
+
+        Returns:
+            PersistentVector: The new vector
+        """
+        items = tuple(items)
+        count = len(items)
+
+        # Everything after the last full leaf stays in the tail
+        tail_start = ((count - 1) & ~MASK) if count else 0
+        nodes = [items[i:i + WIDTH] for i in range(0, tail_start, WIDTH)]
+        tail = items[tail_start:]
+
+        # Group leaves into parents until a single root level remains
+        shift = BITS
+        while len(nodes) > WIDTH:
+            nodes = [tuple(nodes[i:i + WIDTH]) for i in range(0, len(nodes), WIDTH)]
+            shift += BITS
+
+        return cls(count, shift, tuple(nodes), tail)
+
+    def __len__(self):
+        return self._count
+
+    def _tail_offset(self):
+        if self._count < WIDTH:
+            return 0
+        return ((self._count - 1) >> BITS) << BITS
+
+    def _leaf_for(self, index):
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(index >> level) & MASK]
+            level -= BITS
+        return node
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("PersistentVector index out of range")
+        return self._leaf_for(index)[index & MASK]
+
+    def __iter__(self):
+        tail_offset = self._tail_offset()
+        for start in range(0, tail_offset, WIDTH):
+            yield from self._leaf_for(start)
+        yield from self._tail
+
+    def append(self, item):
+        """
+        Return a new vector with an item appended
+
+        Args:
+            item: Element to append
+
+        Returns:
+            PersistentVector: The new vector; this one is left unchanged
+        """
+        # Room left in the tail: copy at most 32 references
+        if self._count - self._tail_offset() < WIDTH:
+            return PersistentVector(self._count + 1, self._shift, self._root, self._tail + (item,))
+
+        # Tail is full: push it into the trie and start a new tail
+        shift = self._shift
+        if (self._count >> BITS) > (1 << shift):
+            # Root overflow, grow the trie by one level
+            root = (self._root, self._new_path(shift, self._tail))
+            shift += BITS
+        else:
+            root = self._push_tail(shift, self._root, self._tail)
+
+        return PersistentVector(self._count + 1, shift, root, (item,))
+
+    def extend(self, items):
+        """
+        Return a new vector with several items appended
+
+        Args:
+            items (iterable): Elements to append
+
+        Returns:
+            PersistentVector: The new vector; this one is left unchanged
+        """
+        vector = self
+        for item in items:
+            vector = vector.append(item)
+        return vector
+
+    def _push_tail(self, level, parent, tail):
+        index = ((self._count - 1) >> level) & MASK
+        if level == BITS:
+            child = tail
+        elif index < len(parent):
+            child = self._push_tail(level - BITS, parent[index], tail)
+        else:
+            child = self._new_path(level - BITS, tail)
+
+        if index < len(parent):
+            return parent[:index] + (child,) + parent[index + 1:]
+        return parent + (child,)
+
+    @staticmethod
+    def _new_path(level, node):
+        while level > 0:
+            node = (node,)
+            level -= BITS
+        return node
+
+
+# A single immutable ledger state; totals (in cents) are carried along so
+# comparing versions never has to walk the transactions. source is whatever
+# the caller needs to restore alongside the rows, e.g. the open ledger folder
+LedgerVersion = namedtuple(
+    "LedgerVersion",
+    ["transactions", "total_income", "total_expenses", "label", "source"],
+    defaults=(None,)
+)
+
+
+class LedgerHistory:
+    """Undo/redo history of ledger versions with named bookmarks"""
+
+    def __init__(self, max_versions=200):
+        self.max_versions = max_versions
+        self.current = LedgerVersion(PersistentVector(), 0, 0, "Empty ledger")
+        self.undo_stack = []
+        self.redo_stack = []
+        self.bookmarks = {}
+
+    def _commit(self, version):
+        self.undo_stack.append(self.current)
+        if len(self.undo_stack) > self.max_versions:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+        self.current = version
+        return version
+
+    def append(self, transaction, label="Add transaction"):
+        """
+        Record a new version with one transaction appended
+
+        Args:
+            transaction (dict): The transaction to append
+            label (str): Description of the change shown to the user
+
+        Returns:
+            LedgerVersion: The new current version
+        """
+        return self.extend((transaction,), label)
+
+    def extend(self, transactions, label="Add transactions"):
+        """
+        Record a new version with several transactions appended
+
+        Args:
+            transactions (list): The transactions to append
+            label (str): Description of the change shown to the user
+
+        Returns:
+            LedgerVersion: The new current version
+        """
+        transactions = list(transactions)
+        income, expenses = totals_cents(transactions)
+        return self._commit(LedgerVersion(
+            self.current.transactions.extend(transactions),
+            self.current.total_income + income,
+            self.current.total_expenses + expenses,
+            label,
+            self.current.source
+        ))
+
+    def replace(self, transactions, label="Replace data", source=None):
+        """
+        Record a new version holding an entirely new set of transactions
+
+        Args:
+            transactions (iterable): The new transactions, or a PersistentVector
+            label (str): Description of the change shown to the user
+            source: Where the transactions came from, kept with the version
+
+        Returns:
+            LedgerVersion: The new current version
+        """
+        if isinstance(transactions, PersistentVector):
+            vector = transactions
+        else:
+            vector = PersistentVector.from_iterable(transactions)
+        total_income, total_expenses = totals_cents(vector)
+        return self._commit(LedgerVersion(vector, total_income, total_expenses, label, source))
+
+    def set_source(self, source):
+        """Change the source of the current version without adding an undo step, e.g. after saving"""
+        self.current = self.current._replace(source=source)
+        return self.current
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self):
+        """
+        Step back to the previous version
+
+        Returns:
+            LedgerVersion: The restored version or None if there is nothing to undo
+        """
+        if not self.undo_stack:
+            return None
+        self.redo_stack.append(self.current)
+        self.current = self.undo_stack.pop()
+        return self.current
+
+    def redo(self):
+        """
+        Step forward to the version that was last undone
+
+        Returns:
+            LedgerVersion: The restored version or None if there is nothing to redo
+        """
+        if not self.redo_stack:
+            return None
+        self.undo_stack.append(self.current)
+        self.current = self.redo_stack.pop()
+        return self.current
+
+    def bookmark(self, name):
+        """Remember the current version under a name"""
+        self.bookmarks[name] = self.current
+        return self.current
+
+    def restore_bookmark(self, name):
+        """
+        Make a bookmarked version current again, as an undoable change
+
+        Args:
+            name (str): Bookmark name
+
+        Returns:
+            LedgerVersion: The new current version or None if the bookmark is unknown
+        """
+        version = self.bookmarks.get(name)
+        if version is None:
+            return None
+        return self._commit(version._replace(label=f"Restore '{name}'"))
+
+    def compare(self, name):
+        """
+        Compare the current version with a bookmark
+
+        Args:
+            name (str): Bookmark name
+
+        Returns:
+            dict: Differences in counts and totals, or None if the bookmark is unknown
+        """
+        version = self.bookmarks.get(name)
+        if version is None:
+            return None
+        current = self.current
+        return {
+            "transactions": len(current.transactions) - len(version.transactions),
+            "total_income": current.total_income - version.total_income,
+            "total_expenses": current.total_expenses - version.total_expenses,
+            "net_balance": (current.total_income - current.total_expenses)
+                           - (version.total_income - version.total_expenses),
+        }
@@ -0,0 +1,114 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import numpy as np
+
+# Amounts are stored as integer cents everywhere; dollars only exist as text
+CENT = Decimal("0.01")
+
+# Largest amount that fits the int64 columns used for storage and export
+MAX_CENTS = 2 ** 63 - 1
+
+
+def _check_magnitude(amount, value):
+    # Rejects huge exponents before any arithmetic could overflow the context
+    if amount and amount.adjusted() > len(str(MAX_CENTS)):
+        raise ValueError(f"Amount is too large: {value!r}")
+
+
+def parse_cents(value, round_sub_cents=False):
+    """
+    Convert an amount to integer cents without going through binary floats
+
+    Args:
+        value (str | int | float | Decimal): Amount in dollars, e.g. "12.34"
+        round_sub_cents (bool): Round sub-cent digits half up instead of
+            rejecting them, as for legacy files that stored float dollars
+
+    Returns:
+        int: The amount in cents
+
+    Raises:
+        ValueError: If the value is not a valid amount or has sub-cent digits
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value!r}")
+
+    if isinstance(value, float):
+        # Legacy files stored float dollars; repr() gives the shortest exact
+        # decimal that round-trips, which is what the user originally typed
+        amount = Decimal(repr(value))
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        _check_magnitude(amount, value)
+        cents = (amount / CENT).to_integral_value(ROUND_HALF_UP)
+    else:
+        try:
+            amount = Decimal(str(value).strip().replace(",", ""))
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}") from None
+
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        _check_magnitude(amount, value)
+
+        if round_sub_cents:
+            cents = (amount / CENT).to_integral_value(ROUND_HALF_UP)
+        elif amount != amount.quantize(CENT):
+            raise ValueError(f"Amount has more than two decimal places: {value!r}")
+        else:
+            cents = amount / CENT
+
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"Amount is too large: {value!r}")
+    return int(cents)
+
+
+def cents_to_str(cents):
+    """Format cents as a plain decimal string such as "-1234.50" """
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{remainder:02d}"
+
+
+def format_cents(cents, signed=False, symbol="$"):
+    """Format cents for display, e.g. "$1234.50", "-$3.20" or "+$3.20" when signed"""
+    text = cents_to_str(cents)
+    if text.startswith("-"):
+        return f"-{symbol}{text[1:]}"
+    if signed and cents > 0:
+        return f"+{symbol}{text}"
+    return f"{symbol}{text}"
+
+
+def cents_to_dollars(cents):
+    """Approximate dollars for display-only consumers such as animations"""
+    return cents / 100
+
+
+def totals_cents(transactions):
+    """
+    Sum income and expenses exactly
+
+    Amounts are gathered into an int64 array and reduced with numpy; a
+    ledger whose sums could overflow int64 is summed with Python integers.
+
+    Args:
+        transactions (iterable): Transactions with amounts in cents
+
+    Returns:
+        tuple: (total income, total expenses) in cents
+    """
+    if not hasattr(transactions, "__len__"):
+        transactions = list(transactions)
+    count = len(transactions)
+    if not count:
+        return 0, 0
+
+    amounts = np.fromiter((transaction["amount"] for transaction in transactions), np.int64, count)
+    income = np.fromiter((transaction["type"] == "Income" for transaction in transactions), np.bool_, count)
+
+    if int(np.abs(amounts).max()) > MAX_CENTS // count:
+        return (
+            sum(int(amount) for amount in amounts[income]),
+            sum(int(amount) for amount in amounts[~income])
+        )
+    return int(amounts[income].sum()), int(amounts[~income].sum())
@@ -0,0 +1,185 @@
+import json
+import os
+from collections import defaultdict
+from src.utils.money import totals_cents
+from src.utils.currency import daily_totals, DEFAULT_CURRENCY
+
+MANIFEST_NAME = "manifest.json"
+
+# Number of most recent months read when a ledger folder is opened
+RECENT_MONTHS = 3
+
+
+def group_by_month(transactions):
+    """Group transactions into YYYY-MM partitions, keeping their order"""
+    groups = defaultdict(list)
+    for transaction in transactions:
+        groups[transaction["date"][:7]].append(transaction)
+    return groups
+
+
+class PartitionedStore:
+    """Ledger stored as one JSON file per month plus a manifest
+
+    The manifest keeps the count and totals of every partition, so all-time
+    totals are available without opening any partition file, and partitions
+    can be read one by one as they are needed.
+    """
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Open an existing partitioned ledger, reading only its manifest
+
+        Args:
+            directory (str): Folder holding the manifest and partitions
+
+        Returns:
+            PartitionedStore: The opened store
+        """
+        with open(os.path.join(directory, MANIFEST_NAME), 'r') as file:
+            manifest = json.load(file)
+
+        if manifest.get("amount_unit") != "cents":
+            raise ValueError("The manifest does not describe a partitioned ledger.")
+        return cls(directory, manifest)
+
+    @classmethod
+    def create(cls, directory, transactions, **extra):
+        """
+        Write a complete ledger as a new set of partitions
+
+        Args:
+            directory (str): Folder to write into; created if needed
+            transactions (iterable): All transactions of the ledger
+            **extra: Additional manifest fields, e.g. budgets or saved_date
+
+        Returns:
+            PartitionedStore: The written store
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        # Replace whatever ledger was in the folder before
+        try:
+            old = cls.open(directory)
+        except (OSError, ValueError):
+            old = None
+
+        store = cls(directory, {"amount_unit": "cents", "partitions": {}})
+        groups = group_by_month(transactions)
+        if old is not None:
+            for month in old.months():
+                groups.setdefault(month, [])
+        store.write_partitions(groups, **extra)
+        return store
+
+    def months(self):
+        """Get all partition months in ascending order"""
+        return sorted(self.manifest["partitions"])
+
+    def totals(self, months=None):
+        """
+        Get totals from the manifest without reading any partition
+
+        Args:
+            months (iterable): Months to include, defaults to all
+
+        Returns:
+            tuple: (total income, total expenses, transaction count) in cents
+        """
+        partitions = self.manifest["partitions"]
+        if months is None:
+            months = partitions
+        income = expenses = count = 0
+        for month in months:
+            entry = partitions.get(month)
+            if entry:
+                income += entry["income"]
+                expenses += entry["expenses"]
+                count += entry["count"]
+        return income, expenses, count
+
+    def daily_totals(self, months):
+        """
+        Get per-day, per-currency totals from the manifest for currency conversion
+
+        Args:
+            months (iterable): Months to include
+
+        Returns:
+            list: [date, currency, income, expenses] rows in cents
+        """
+        rows = []
+        for month in months:
+            entry = self.manifest["partitions"].get(month)
+            if not entry:
+                continue
+            if "daily" in entry:
+                rows.extend(entry["daily"])
+            else:
+                # Manifests written before currencies were tracked hold base currency totals
+                rows.append([f"{month}-01", DEFAULT_CURRENCY, entry["income"], entry["expenses"]])
+        return rows
+
+    def read_partition(self, month):
+        """
+        Read the transactions of one month
+
+        Args:
+            month (str): Month as YYYY-MM
+
+        Returns:
+            list: The transactions, or an empty list if there is no such partition
+        """
+        entry = self.manifest["partitions"].get(month)
+        if entry is None:
+            return []
+        with open(os.path.join(self.directory, entry["file"]), 'r') as file:
+            return json.load(file)["transactions"]
+
+    def write_partitions(self, groups, **extra):
+        """
+        Write changed partitions and update the manifest
+
+        Partitions not mentioned in groups are left untouched; a month mapped
+        to an empty list is removed.
+
+        Args:
+            groups (dict): Month to the complete list of its transactions
+            **extra: Manifest fields to set, e.g. budgets or saved_date
+        """
+        partitions = self.manifest["partitions"]
+        for month, transactions in groups.items():
+            file_name = f"{month}.json"
+            file_path = os.path.join(self.directory, file_name)
+
+            if not transactions:
+                partitions.pop(month, None)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                continue
+
+            self._write_json(file_path, {"month": month, "amount_unit": "cents", "transactions": transactions})
+            income, expenses = totals_cents(transactions)
+            partitions[month] = {
+                "file": file_name,
+                "count": len(transactions),
+                "income": income,
+                "expenses": expenses,
+                "daily": daily_totals(transactions),
+            }
+
+        self.manifest.update(extra)
+        self._write_json(os.path.join(self.directory, MANIFEST_NAME), self.manifest, indent=4)
+
+    @staticmethod
+    def _write_json(file_path, data, indent=None):
+        # Write to a temporary file first so a crash never leaves half a partition
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(data, file, indent=indent)
+        os.replace(temp_path, file_path)
@@ -0,0 +1,421 @@
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from src.utils.money import parse_cents, cents_to_str
+
+
+class QueryError(ValueError):
+    """Raised when a search query cannot be parsed"""
+
+
+# Sorts after every character that appears in an ISO date, so a prefix such as
+# "2025-06" can be turned into the exclusive upper bound "2025-06~"
+DATE_PREFIX_END = "~"
+
+FIELD_ALIASES = {
+    "type": "type",
+    "date": "date",
+    "desc": "description",
+    "description": "description",
+    "amount": "amount",
+}
+
+TERM_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<field>[A-Za-z]+)\s*(?P<op>:|>=|<=|>|<|=)\s*(?P<value>"[^"]*"|[^\s"]+)
+      | (?P<quoted>"[^"]*")
+      | (?P<word>[^\s"]+)
+    )
+''', re.VERBOSE)
+
+DATE_PATTERN = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+
+MISSING_VALUE_PATTERN = re.compile(r"^[A-Za-z]+(:|>=|<=|>|<|=)$")
+
+
+class LedgerIndex:
+    """Access paths over a list of transactions used by the query planner"""
+
+    def __init__(self, transactions=(), category_of=None):
+        # Categories may come from rules rather than the transactions themselves
+        self.category_of = category_of or (lambda transaction: transaction.get("category"))
+        self.transactions = []
+        self.date_keys = []
+        self.date_positions = []
+        self.amount_keys = []
+        self.amount_positions = []
+        self.type_partitions = {}
+        self.descriptions = {}
+
+        self.add_all(transactions)
+
+    def add_all(self, transactions):
+        """Index a batch of transactions, merging it into the range indexes once"""
+        start = len(self.transactions)
+        self.transactions.extend(transactions)
+        if len(self.transactions) == start:
+            return
+
+        for position in range(start, len(self.transactions)):
+            self._add_to_partitions(position, self.transactions[position])
+
+        # Only the new rows are sorted; they are then merged into the existing
+        # sorted columns in one pass
+        self.date_keys, self.date_positions = self._merge_sorted(
+            "date", start, self.date_keys, self.date_positions)
+        self.amount_keys, self.amount_positions = self._merge_sorted(
+            "amount", start, self.amount_keys, self.amount_positions)
+
+    def _merge_sorted(self, field, start, keys, positions):
+        transactions = self.transactions
+        new_positions = sorted(range(start, len(transactions)), key=lambda i: transactions[i][field])
+        new_keys = [transactions[i][field] for i in new_positions]
+        if not keys:
+            return new_keys, new_positions
+
+        # Find where each new key goes and copy the existing runs between
+        # those points as slices; existing rows come first among equal keys,
+        # as with add()
+        merged_keys = []
+        merged_positions = []
+        previous = 0
+        for key, position in zip(new_keys, new_positions):
+            cut = bisect_right(keys, key, previous)
+            merged_keys += keys[previous:cut]
+            merged_positions += positions[previous:cut]
+            merged_keys.append(key)
+            merged_positions.append(position)
+            previous = cut
+        merged_keys += keys[previous:]
+        merged_positions += positions[previous:]
+        return merged_keys, merged_positions
+
+    def add(self, transaction):
+        """Index a single appended transaction"""
+        position = len(self.transactions)
+        self.transactions.append(transaction)
+        self._add_to_partitions(position, transaction)
+
+        index = bisect_right(self.date_keys, transaction["date"])
+        self.date_keys.insert(index, transaction["date"])
+        self.date_positions.insert(index, position)
+
+        index = bisect_right(self.amount_keys, transaction["amount"])
+        self.amount_keys.insert(index, transaction["amount"])
+        self.amount_positions.insert(index, position)
+
+    def _add_to_partitions(self, position, transaction):
+        self.type_partitions.setdefault(transaction["type"].lower(), []).append(position)
+        self.descriptions.setdefault(transaction["description"].lower(), []).append(position)
+
+
+class Predicate:
+    """A single condition of a compiled query"""
+
+    def cost(self, index):
+        """Estimated number of rows visited when used as the access path, or None"""
+        return None
+
+    def candidates(self, index):
+        """Positions selected through this predicate's access path"""
+        raise NotImplementedError
+
+    def matches(self, transaction, index):
+        raise NotImplementedError
+
+
+class RangePredicate(Predicate):
+    """Half-open [low, high) range over a sorted key column"""
+
+    def __init__(self, field, low=None, high=None, low_inclusive=True, high_inclusive=False):
+        self.field = field
+        self.low = low
+        self.high = high
+        self.low_inclusive = low_inclusive
+        self.high_inclusive = high_inclusive
+
+    def _columns(self, index):
+        if self.field == "date":
+            return index.date_keys, index.date_positions
+        return index.amount_keys, index.amount_positions
+
+    def _bounds(self, keys):
+        start = 0
+        end = len(keys)
+        if self.low is not None:
+            start = (bisect_left if self.low_inclusive else bisect_right)(keys, self.low)
+        if self.high is not None:
+            end = (bisect_right if self.high_inclusive else bisect_left)(keys, self.high)
+        return start, max(start, end)
+
+    def cost(self, index):
+        start, end = self._bounds(self._columns(index)[0])
+        return end - start
+
+    def candidates(self, index):
+        keys, positions = self._columns(index)
+        start, end = self._bounds(keys)
+        return positions[start:end]
+
+    def matches(self, transaction, index):
+        value = transaction[self.field]
+        if self.low is not None:
+            if value < self.low or (value == self.low and not self.low_inclusive):
+                return False
+        if self.high is not None:
+            if value > self.high or (value == self.high and not self.high_inclusive):
+                return False
+        return True
+
+
+class TypePredicate(Predicate):
+    """Exact match on the Income/Expense partition"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def cost(self, index):
+        return len(index.type_partitions.get(self.value, ()))
+
+    def candidates(self, index):
+        return index.type_partitions.get(self.value, [])
+
+    def matches(self, transaction, index):
+        return transaction["type"].lower() == self.value
+
+
+class DescriptionPredicate(Predicate):
+    """Substring match evaluated once per distinct description"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def cost(self, index):
+        # Scanning distinct descriptions is cheaper than a row scan only when
+        # descriptions repeat, which they do for real ledgers
+        return len(index.descriptions) * 2
+
+    def candidates(self, index):
+        positions = []
+        for description, rows in index.descriptions.items():
+            if self.value in description:
+                positions.extend(rows)
+        return positions
+
+    def matches(self, transaction, index):
+        return self.value in transaction["description"].lower()
+
+
+class TextPredicate(Predicate):
+    """Free text matched against every column, like the original search box"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def matches(self, transaction, index):
+        value = self.value
+        return (value in transaction["description"].lower() or
+                value in transaction["date"].lower() or
+                value in transaction["type"].lower() or
+                value in (index.category_of(transaction) or "").lower() or
+                value in cents_to_str(transaction["amount"]))
+
+
+class Query:
+    """A compiled search query"""
+
+    def __init__(self, text, predicates):
+        self.text = text
+        self.predicates = predicates
+
+    def date_bounds(self):
+        """
+        Get the overall date range this query is restricted to
+
+        Returns:
+            tuple: (low, high) date strings, either may be None; or None if
+            the query has no date condition
+        """
+        bounds = None
+        for predicate in self.predicates:
+            if isinstance(predicate, RangePredicate) and predicate.field == "date":
+                low, high = bounds or (None, None)
+                if predicate.low is not None and (low is None or predicate.low > low):
+                    low = predicate.low
+                if predicate.high is not None and (high is None or predicate.high < high):
+                    high = predicate.high
+                bounds = (low, high)
+        return bounds
+
+    def plan(self, index):
+        """
+        Pick the cheapest access path for this query
+
+        Args:
+            index (LedgerIndex): Index over the transactions being searched
+
+        Returns:
+            tuple: (access predicate or None, remaining predicates)
+        """
+        best = None
+        best_cost = len(index.transactions)
+        for predicate in self.predicates:
+            cost = predicate.cost(index)
+            if cost is not None and cost < best_cost:
+                best, best_cost = predicate, cost
+
+        remaining = [predicate for predicate in self.predicates if predicate is not best]
+        return best, remaining
+
+    def execute(self, index):
+        """
+        Run the query against an index
+
+        Args:
+            index (LedgerIndex): Index over the transactions being searched
+
+        Returns:
+            list: Positions of matching transactions in their original order
+        """
+        transactions = index.transactions
+        access, remaining = self.plan(index)
+
+        if access is None:
+            positions = range(len(transactions))
+        else:
+            positions = sorted(access.candidates(index))
+
+        if not remaining:
+            return list(positions)
+        return [
+            position for position in positions
+            if all(predicate.matches(transactions[position], index) for predicate in remaining)
+        ]
+
+
+def _unquote(value):
+    if value.startswith('"'):
+        return value[1:-1]
+    return value
+
+
+def _parse_amount(value):
+    try:
+        return parse_cents(value)
+    except ValueError:
+        raise QueryError(f"Invalid amount '{value}'") from None
+
+
+def _parse_date(value):
+    if not DATE_PATTERN.match(value):
+        raise QueryError(f"Invalid date '{value}', expected YYYY, YYYY-MM or YYYY-MM-DD")
+    return value
+
+
+def _range_predicate(field, op, value, parse):
+    if op in (":", "="):
+        if ".." in value:
+            low, high = value.split("..", 1)
+            low = parse(low) if low else None
+            high = parse(high) if high else None
+            if field == "date":
+                return RangePredicate(field, low, high and high + DATE_PREFIX_END)
+            return RangePredicate(field, low, high, high_inclusive=True)
+
+        value = parse(value)
+        if field == "date":
+            return RangePredicate(field, value, value + DATE_PREFIX_END)
+        return RangePredicate(field, value, value, high_inclusive=True)
+
+    value = parse(value)
+    if field == "date" and op in (">", "<="):
+        # Compare against the whole prefix, so date>2025-03 starts in April
+        value += DATE_PREFIX_END
+    if op == ">":
+        return RangePredicate(field, low=value, low_inclusive=False)
+    if op == ">=":
+        return RangePredicate(field, low=value)
+    if op == "<":
+        return RangePredicate(field, high=value)
+    return RangePredicate(field, high=value, high_inclusive=True)
+
+
+def _field_predicate(field, op, value):
+    name = FIELD_ALIASES.get(field.lower())
+    if name is None:
+        raise QueryError(f"Unknown field '{field}', expected one of: type, date, desc, amount")
+
+    value = _unquote(value)
+    if not value:
+        raise QueryError(f"Missing value for '{field}'")
+
+    if name == "type":
+        if op != ":":
+            raise QueryError("Use type:income or type:expense")
+        value = value.lower()
+        if value not in ("income", "expense"):
+            raise QueryError(f"Unknown type '{value}', expected income or expense")
+        return TypePredicate(value)
+
+    if name == "description":
+        if op != ":":
+            raise QueryError('Use desc:word or desc:"several words"')
+        return DescriptionPredicate(value.lower())
+
+    if name == "date":
+        return _range_predicate(name, op, value, _parse_date)
+    return _range_predicate(name, op, value, _parse_amount)
+
+
+@lru_cache(maxsize=128)
+def compile_query(text):
+    """
+    Compile search box text into a query
+
+    Supports free text plus field terms such as ``type:expense``,
+    ``amount>100``, ``amount:10..50``, ``date:2025-03..2025-06`` and
+    ``desc:"coffee shop"``.
+
+    Amount terms compare each transaction's amount in its own currency, so
+    ``amount>100`` matches 150 EUR and 150 INR alike; the amount index is
+    kept in stored cents and nothing is converted.
+
+    Args:
+        text (str): The query text
+
+    Returns:
+        Query: The compiled query
+
+    Raises:
+        QueryError: If the query is malformed
+    """
+    if text.count('"') % 2:
+        raise QueryError("Unterminated quote")
+
+    predicates = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TERM_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected input at '{text[position:]}'")
+        position = match.end()
+
+        field = match.group("field")
+        if field and field.lower() in FIELD_ALIASES:
+            predicates.append(_field_predicate(field, match.group("op"), match.group("value")))
+        elif field:
+            # Not a filter, e.g. "Ref:123" or "http://..."; match it as text
+            text_value = field + match.group("op") + _unquote(match.group("value"))
+            predicates.append(TextPredicate(text_value.lower()))
+        elif match.group("quoted") is not None:
+            value = _unquote(match.group("quoted")).lower()
+            if value:
+                predicates.append(TextPredicate(value))
+        else:
+            word = match.group("word")
+            if MISSING_VALUE_PATTERN.match(word) and word.rstrip(":<>=").lower() in FIELD_ALIASES:
+                raise QueryError(f"Missing value for '{word}'")
+            predicates.append(TextPredicate(word.lower()))
+
+    return Query(text, predicates)
@@ -0,0 +1,172 @@
+"""Headless report generation
+
+Renders summary charts per period with the matplotlib Agg backend in a pool of
+worker processes, so report packs for many ledgers can be produced without a
+display and in parallel across cores.
+
+Usage:
+    python -m src.utils.reports ledger.json [more.json ...] --out reports --period month
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Characters allowed in generated file names
+SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+PERIODS = {
+    "month": 7,  # YYYY-MM
+    "year": 4,   # YYYY
+}
+
+
+def split_by_period(transactions, period="month"):
+    """
+    Group transactions by month or year
+
+    Args:
+        transactions (iterable): Transactions to group
+        period (str): "month" or "year"
+
+    Returns:
+        dict: Period key (YYYY-MM or YYYY) to list of transactions, in date order
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}', expected one of: {', '.join(PERIODS)}")
+
+    width = PERIODS[period]
+    groups = defaultdict(list)
+    for transaction in transactions:
+        groups[transaction["date"][:width]].append(transaction)
+    return dict(sorted(groups.items()))
+
+
+def _init_worker():
+    """Select the non-interactive backend before anything imports pyplot"""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_period(ledger_name, period_key, transactions, out_dir, formats=("png", "pdf"), currency=None):
+    """
+    Render one period's charts to image files
+
+    Runs inside a worker process; uses the Agg canvas directly so no display
+    or GUI toolkit is needed.
+
+    Args:
+        ledger_name (str): Name of the ledger the period belongs to
+        period_key (str): Period label, e.g. "2025-06"
+        transactions (list): Transactions in the period
+        out_dir (str): Directory the files are written to
+        formats (tuple): File formats to write, e.g. ("png", "pdf")
+        currency (str): Currency all amounts are in, shown on the charts
+
+    Returns:
+        dict: Manifest entry with the written files and period totals
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from src.utils.chart_figures import draw_summary
+
+    figure = Figure(figsize=(11, 8.5), dpi=100)
+    FigureCanvasAgg(figure)
+    summary = draw_summary(figure, transactions, title=f"{ledger_name} — {period_key}", currency=currency)
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+    for file_format in formats:
+        file_path = os.path.join(out_dir, f"{SAFE_NAME.sub('_', period_key)}.{file_format}")
+        figure.savefig(file_path, format=file_format, facecolor=figure.get_facecolor())
+        files.append(file_path)
+
+    return {
+        "ledger": ledger_name,
+        "period": period_key,
+        "transactions": len(transactions),
+        "total_income": summary["total_income"],
+        "total_expenses": summary["total_expenses"],
+        "files": files,
+    }
+
+
+def generate_reports(ledgers, out_dir, period="month", formats=("png", "pdf"), max_workers=None, currency=None):
+    """
+    Render a report bundle for one or more ledgers in parallel
+
+    Amounts are summed as they are, so mixed-currency ledgers should be
+    converted first, e.g. with convert_transactions.
+
+    Args:
+        ledgers (dict): Ledger name to list of transactions (amounts in cents)
+        out_dir (str): Directory for the bundle; one sub-directory per ledger
+        period (str): "month" or "year"
+        formats (tuple): File formats to write for each period
+        max_workers (int): Worker processes, defaults to the number of cores
+        currency (str): Currency all amounts are in, recorded in the manifest
+
+    Returns:
+        str: Path of the bundle manifest (report.json)
+    """
+    jobs = []
+    for ledger_name, transactions in ledgers.items():
+        ledger_dir = os.path.join(out_dir, SAFE_NAME.sub("_", ledger_name))
+        for period_key, period_transactions in split_by_period(transactions, period).items():
+            jobs.append((ledger_name, period_key, period_transactions, ledger_dir, tuple(formats), currency))
+
+    entries = []
+    if jobs:
+        # Spawned workers never inherit the parent's Tk state or pyplot backend
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker) as executor:
+            futures = [executor.submit(render_period, *job) for job in jobs]
+            for future in as_completed(futures):
+                entries.append(future.result())
+
+    entries.sort(key=lambda entry: (entry["ledger"], entry["period"]))
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "report.json")
+    with open(manifest_path, 'w') as file:
+        json.dump({"period": period, "amount_unit": "cents", "currency": currency, "reports": entries}, file, indent=4)
+
+    return manifest_path
+
+
+def main(argv=None):
+    """Command line entry point for rendering report packs"""
+    from src.utils.file_handler import FileHandler
+    from src.utils.currency import RateTable, DEFAULT_CURRENCY, RATES_DIR, convert_transactions, normalize_currency
+
+    parser = argparse.ArgumentParser(description="Render monthly or annual finance reports without a display.")
+    parser.add_argument("ledgers", nargs="+", help="saved JSON ledger files")
+    parser.add_argument("--out", default="reports", help="output directory for the report bundle")
+    parser.add_argument("--period", choices=sorted(PERIODS), default="month")
+    parser.add_argument("--format", dest="formats", action="append", choices=["png", "pdf", "svg"],
+                        help="file format to write (repeatable, default png and pdf)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--currency", type=normalize_currency, default=DEFAULT_CURRENCY,
+                        help=f"currency to report in, converted with the rate tables in {RATES_DIR}/")
+    args = parser.parse_args(argv)
+
+    rates = RateTable.load_directory()
+    ledgers = {}
+    for file_path in args.ledgers:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        transactions = FileHandler.read_data(file_path).get("transactions", [])
+        ledgers[name], missing = convert_transactions(transactions, rates, args.currency)
+        if missing:
+            print(f"{name}: no {args.currency} rates for {', '.join(missing)}; those amounts are left out")
+
+    manifest_path = generate_reports(
+        ledgers, args.out, args.period, args.formats or ("png", "pdf"), args.workers, args.currency
+    )
+    print(f"Report bundle written to {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import datetime
+import html
+import os
+import re
+from src.utils.money import parse_cents
+from src.utils.currency import normalize_currency
+
+# Bytes read per step; together with one partial element this bounds memory
+CHUNK_SIZE = 64 * 1024
+
+# OFX transaction fields we care about
+OFX_FIELDS = {"TRNTYPE", "DTPOSTED", "TRNAMT", "NAME", "PAYEE", "MEMO", "FITID"}
+
+QIF_DATE_PATTERN = re.compile(r"^\s*(\d{1,4})\s*[/.-]\s*(\d{1,2})\s*(?:[/.-]|')\s*(\d{1,4})\s*$")
+
+
+class StatementError(ValueError):
+    """Raised when a bank statement cannot be parsed"""
+
+
+def _amount_to_cents(text):
+    text = text.strip().replace(" ", "")
+    # Some banks write a decimal comma, e.g. "-12,50"
+    if "," in text and "." not in text:
+        text = text.replace(",", ".")
+    return parse_cents(text)
+
+
+def _signed_transaction(date, description, cents, category=None, currency=None):
+    """Map a signed statement amount to an Income or Expense transaction"""
+    transaction = {
+        "date": date,
+        "description": description or "Unknown",
+        "amount": abs(cents),
+        "type": "Expense" if cents < 0 else "Income"
+    }
+    if category:
+        transaction["category"] = category
+    if currency:
+        transaction["currency"] = currency
+    return transaction
+
+
+def _ofx_date(value):
+    digits = value.strip()[:8]
+    if len(digits) != 8 or not digits.isdigit():
+        raise StatementError(f"Invalid OFX date '{value}'")
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+
+
+def _ofx_transaction(fields, currency):
+    if "TRNAMT" not in fields or "DTPOSTED" not in fields:
+        raise StatementError("OFX transaction without TRNAMT or DTPOSTED")
+
+    try:
+        cents = _amount_to_cents(fields["TRNAMT"])
+    except ValueError:
+        raise StatementError(f"Invalid OFX amount '{fields['TRNAMT']}'") from None
+
+    # TRNAMT is signed, so a positive POS or ATM amount is a refund, not a charge;
+    # zero-amount rows (e.g. card checks) are no income or expense at all
+    if cents == 0:
+        return None
+
+    description = fields.get("NAME") or fields.get("PAYEE") or fields.get("MEMO") or fields.get("TRNTYPE")
+    return _signed_transaction(_ofx_date(fields["DTPOSTED"]), description, cents, currency=currency)
+
+
+def iter_ofx(file):
+    """
+    Stream transactions from an OFX/QFX statement
+
+    Handles both the SGML (OFX 1.x, unclosed leaf elements) and XML (OFX 2.x)
+    variants. The document is scanned chunk by chunk and never held in memory.
+
+    Args:
+        file: Text file object positioned at the start of the statement
+
+    Yields:
+        dict: Transactions with amounts in cents
+    """
+    fields = None
+    currency = None
+    buffer = ""
+
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        buffer += chunk
+
+        # The text after the last "<" may continue in the next chunk
+        end = len(buffer) if not chunk else buffer.rfind("<")
+        if end <= 0:
+            if not chunk:
+                break
+            continue
+
+        for part in buffer[:end].split("<"):
+            tag, _, text = part.partition(">")
+            tag = tag.strip().upper()
+            if not tag or tag.startswith(("?", "!")):
+                continue
+
+            if tag == "STMTTRN":
+                fields = {}
+            elif tag == "/STMTTRN":
+                transaction = None if fields is None else _ofx_transaction(fields, currency)
+                if transaction is not None:
+                    yield transaction
+                fields = None
+            elif tag == "CURDEF":
+                # Default currency of the statement that follows
+                try:
+                    currency = normalize_currency(text) if text.strip() else None
+                except ValueError as e:
+                    raise StatementError(f"CURDEF: {e}") from None
+            elif fields is not None and tag in OFX_FIELDS:
+                fields[tag] = html.unescape(text.strip())
+
+        buffer = buffer[end:]
+        if not chunk:
+            break
+
+
+def _qif_date(value):
+    value = value.strip()
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+
+    match = QIF_DATE_PATTERN.match(value)
+    if not match:
+        raise StatementError(f"Invalid QIF date '{value}'")
+
+    first, second, third = (int(group) for group in match.groups())
+    if len(match.group(1)) == 4:
+        year, month, day = first, second, third
+    else:
+        # US month/day order; two-digit years (and the 6/1'05 style) are 2000s
+        month, day, year = first, second, third
+        if year < 100:
+            year += 2000 if "'" in value or year < 70 else 1900
+
+    try:
+        return datetime.date(year, month, day).strftime("%Y-%m-%d")
+    except ValueError:
+        raise StatementError(f"Invalid QIF date '{value}'") from None
+
+
+def iter_qif(file):
+    """
+    Stream transactions from a QIF statement, one record at a time
+
+    Args:
+        file: Text file object positioned at the start of the statement
+
+    Yields:
+        dict: Transactions with amounts in cents
+    """
+    record = {}
+    skipping = False
+
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+
+        code, value = line[0], line[1:]
+        if code == "!":
+            # Only bank, cash and card sections hold plain transactions
+            section = value.strip().lower()
+            if section.startswith("type:"):
+                skipping = not section.startswith(("type:bank", "type:cash", "type:ccard", "type:oth"))
+            elif section == "account":
+                skipping = True
+            record = {}
+        elif code == "^":
+            if record and not skipping:
+                if "T" not in record or "D" not in record:
+                    raise StatementError(f"QIF record ending on line {line_number} has no date or amount")
+                try:
+                    cents = _amount_to_cents(record["T"])
+                except ValueError:
+                    raise StatementError(f"Invalid QIF amount '{record['T']}' on line {line_number}") from None
+                if cents:
+                    yield _signed_transaction(
+                        _qif_date(record["D"]),
+                        (record.get("P") or record.get("M") or "").strip(),
+                        cents,
+                        record.get("L", "").strip() or None
+                    )
+            record = {}
+        elif code == "U":
+            record.setdefault("T", value)
+        elif code in "DTPML":
+            record[code] = value
+
+
+def iter_statement(file_path):
+    """
+    Stream transactions from an OFX, QFX or QIF file chosen by extension
+
+    Args:
+        file_path (str): Path of the statement
+
+    Yields:
+        dict: Transactions with amounts in cents
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".ofx", ".qfx"):
+        parser = iter_ofx
+    elif extension == ".qif":
+        parser = iter_qif
+    else:
+        raise StatementError(f"Unsupported statement format '{extension or file_path}'")
+
+    # Undecodable bytes from Latin-1 exports are replaced rather than failing the import
+    with open(file_path, 'r', encoding="utf-8", errors="replace", newline=None) as file:
+        yield from parser(file)
@@ -0,0 +1,78 @@
+import json
+import socket
+import time
+import unittest
+from src.utils.ingest_server import IngestServer
+
+
+class IngestServerRoundTrip(unittest.TestCase):
+    """Drive the ingestion server with a local client"""
+
+    def setUp(self):
+        self.server = IngestServer(port=0, batch_interval=0.01)
+        self.address = self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def send(self, lines):
+        """Send lines, close the sending side and return the server's replies"""
+        with socket.create_connection(self.address, timeout=5) as client:
+            client.sendall("".join(line + "\n" for line in lines).encode())
+            client.shutdown(socket.SHUT_WR)
+            replies = b""
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                replies += data
+        return [json.loads(line) for line in replies.decode().splitlines()]
+
+    def drain_until(self, count):
+        transactions = []
+        deadline = time.monotonic() + 5
+        while len(transactions) < count and time.monotonic() < deadline:
+            transactions.extend(self.server.drain())
+            time.sleep(0.01)
+        return transactions
+
+    def test_valid_records_arrive_in_order(self):
+        records = [
+            {"date": "2025-03-01", "description": f"Item {i}", "amount": "1.25", "type": "expense"}
+            for i in range(2500)
+        ]
+        replies = self.send(json.dumps(record) for record in records)
+
+        self.assertEqual(replies, [{"accepted": 2500, "rejected": 0}])
+        transactions = self.drain_until(2500)
+        self.assertEqual([t["description"] for t in transactions], [r["description"] for r in records])
+        self.assertEqual(transactions[0]["amount"], 125)
+        self.assertEqual(transactions[0]["type"], "Expense")
+
+    def test_bad_records_are_rejected_per_line(self):
+        replies = self.send([
+            '{"description": "Huge", "amount": 1e400, "type": "Expense"}',
+            "[" * 20000 + "]" * 20000,
+            "not json",
+            '{"description": "Salary", "amount": 100, "type": "Income", "currency": "eur"}',
+        ])
+
+        self.assertEqual([reply.get("line") for reply in replies[:-1]], [1, 2, 3])
+        self.assertEqual(replies[-1], {"accepted": 1, "rejected": 3})
+        transactions = self.drain_until(1)
+        self.assertEqual(transactions, [
+            {"date": transactions[0]["date"], "description": "Salary", "amount": 10000,
+             "type": "Income", "currency": "EUR"}
+        ])
+
+    def test_stop_keeps_accepted_records(self):
+        self.send(
+            json.dumps({"date": "2025-03-01", "description": f"Item {i}", "amount": 1, "type": "Income"})
+            for i in range(6000)
+        )
+        self.server.stop()
+        self.assertEqual(len(self.server.drain()), 6000)
+
+
+if __name__ == "__main__":
+    unittest.main()